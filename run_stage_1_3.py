@@ -1,10 +1,17 @@
 import asyncio
+import sys
 
 from starter_code.src.events.event_bus import EventBus
+from starter_code.src.events.event_types import EventType
 from starter_code.src.agents.coordinator import CoordinatorAgent
 from starter_code.src.agents.security_agent import SecurityAgent
 from starter_code.src.context.shared_context import SharedContext
 from starter_code.src.agents.bug_agent import BugAgent
+from starter_code.src.runtime import run
+
+
+# Flush piped output at these points rather than after every event
+_FLUSH_ON = {EventType.AGENT_COMPLETED, EventType.AGENT_ERROR}
 
 
 async def main():
@@ -13,11 +20,23 @@ async def main():
     # Subscribe early
     queue = event_bus.subscribe()
 
-    # Printer task
+    # Printer task: readable output on a terminal, JSON lines when piped
+    interactive = sys.stdout.isatty()
+
     async def printer():
+        out = sys.stdout.buffer
+
         while True:
             event = await queue.get()
-            print(event)
+
+            if interactive:
+                print(event)
+            else:
+                out.write(event.to_bytes() + b"\n")
+                if event.event_type in _FLUSH_ON:
+                    out.flush()
+
+            queue.task_done()
 
     printer_task = asyncio.create_task(printer())
 
@@ -44,10 +63,11 @@ async def main():
         context={"shared_context": shared_context},
     )
 
-    # Flush events
-    await asyncio.sleep(1)
+    # Wait until the printer has handled every event
+    await event_bus.drain()
 
     printer_task.cancel()
+    sys.stdout.flush()
 
     try:
         await printer_task
@@ -57,4 +77,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -8,11 +8,23 @@ BaseAgent - shared lifecycle, event emission, and utilities for all agents.
 """
 
 from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import asyncio
+import itertools
+import sys
+import time
 
+from ..config import config
 from ..events import EventBus, EventType, Event
+from ..llm.base import LLMClient
+from ..llm.fusion import current_fuser
+from ..llm.openai_client import OpenAIClient
+
+
+# Process-wide sequence for tool_call_ids; unique without relying on
+# clock resolution
+_tool_call_seq = itertools.count()
 
 
 class BaseAgent(ABC):
@@ -32,11 +44,16 @@ class BaseAgent(ABC):
         agent_config: Dict[str, Any],
         event_bus: EventBus,
     ):
-        self.agent_id = agent_id
-        self.agent_type = agent_type
+        # Interned: every event this agent emits shares these strings
+        self.agent_id = sys.intern(agent_id)
+        self.agent_type = sys.intern(agent_type)
         self.agent_config = agent_config
         self.event_bus = event_bus
 
+        # Streamed thinking chunks waiting to be published as one event
+        self._thinking_buffer: List[str] = []
+        self._thinking_buffered_at = 0.0
+
     # ---------------------------------------------------------------------
     # Abstract API
     # ---------------------------------------------------------------------
@@ -73,6 +90,88 @@ class BaseAgent(ABC):
         """
         return []
 
+    # ---------------------------------------------------------------------
+    # LLM access
+    # ---------------------------------------------------------------------
+
+    @cached_property
+    def _llm(self) -> LLMClient:
+        """
+        LLM client, created on first use.
+
+        Agents that never call the LLM (e.g. in tests) never build one.
+        Assigning ``self._llm`` overrides it.
+        """
+        return OpenAIClient.shared()
+
+    async def _call_llm(
+        self,
+        user_prompt: str,
+        on_chunk: Optional[Callable[[str], Awaitable[None]]] = None,
+        stream_thinking: bool = True,
+    ) -> str:
+        """
+        Send the system prompt and ``user_prompt`` to this agent's LLM.
+
+        The system prompt is always the first (static) part of the request
+        and all agents of one type share a prompt cache key, so repeated
+        calls hit the provider's prompt cache. Output is streamed and each
+        chunk is emitted as a thinking event. Token usage, including
+        cached tokens, is emitted as an llm_usage event.
+
+        Uses ``self._llm`` (the shared OpenAI client unless overridden).
+
+        Args:
+            user_prompt: The request-specific prompt
+            on_chunk: Awaited with each output chunk as it arrives, e.g.
+                to parse findings incrementally
+            stream_thinking: Emit the output as thinking events; turn off
+                for concurrent duplicate requests
+
+        Returns:
+            The full response text
+        """
+        # Plan steps started together may share one fused request
+        fuser = current_fuser.get()
+
+        if fuser is not None:
+            fused = await fuser.call(self.agent_type, self.system_prompt, user_prompt)
+
+            if fused is not None:
+                if stream_thinking:
+                    await self._stream_thinking(fused)
+                    await self._flush_thinking()
+
+                if on_chunk is not None:
+                    await on_chunk(fused)
+
+                return fused
+
+        chunks: List[str] = []
+        usage: Dict[str, int] = {}
+
+        async for chunk in self._llm.stream(
+            system_prompt=self.system_prompt,
+            user_prompt=user_prompt,
+            tools=self.get_tools() or None,
+            cache_key=f"ai_code_review:{self.agent_type}",
+            usage=usage,
+        ):
+            chunks.append(chunk)
+
+            if stream_thinking:
+                await self._stream_thinking(chunk)
+
+            if on_chunk is not None:
+                await on_chunk(chunk)
+
+        await self._flush_thinking()
+
+        if usage:
+            await self._emit_event(EventType.LLM_USAGE, usage)
+
+        return "".join(chunks).strip()
+
     # ---------------------------------------------------------------------
     # Lifecycle & observability helpers
     # ---------------------------------------------------------------------
@@ -83,11 +182,18 @@ class BaseAgent(ABC):
         data: Dict[str, Any],
     ) -> None:
         """Emit a structured event via the event bus."""
+        # Nobody listening: skip building the event at all
+        if not self.event_bus.has_subscribers(event_type):
+            return
+
+        # Keep ordering: pending thinking goes out before anything else
+        if self._thinking_buffer:
+            await self._flush_thinking()
+
         event = Event(
             event_type=event_type,
             agent_id=self.agent_id,
             data=data,
-            timestamp=datetime.utcnow().isoformat() + "Z",
         )
         await self.event_bus.publish(event)
 
@@ -127,6 +233,43 @@ class BaseAgent(ABC):
             },
         )
 
+    async def _stream_thinking(self, chunk: str) -> None:
+        """
+        Buffer a streamed thinking chunk.
+
+        Chunks are published together as one thinking event once the
+        batch window (config.thinking_flush_interval_seconds) has passed,
+        instead of one event bus round trip per token.
+        """
+        if not self.event_bus.has_subscribers(EventType.THINKING):
+            return
+
+        now = time.monotonic()
+
+        if not self._thinking_buffer:
+            self._thinking_buffered_at = now
+
+        self._thinking_buffer.append(chunk)
+
+        if now - self._thinking_buffered_at >= config.thinking_flush_interval_seconds:
+            await self._flush_thinking()
+
+    async def _flush_thinking(self) -> None:
+        """Publish buffered thinking chunks as a single thinking event."""
+        if not self._thinking_buffer:
+            return
+
+        chunks = self._thinking_buffer
+        self._thinking_buffer = []
+
+        await self._emit_event(
+            EventType.THINKING,
+            {
+                "content": "".join(chunks),
+                "chunks": chunks,
+            },
+        )
+
     async def _emit_tool_call_start(
         self,
         tool_name: str,
@@ -139,7 +282,9 @@ class BaseAgent(ABC):
         Returns:
             tool_call_id for correlation with result
         """
-        tool_call_id = f"{self.agent_id}_{tool_name}_{datetime.utcnow().timestamp()}"
+        tool_call_id = (
+            f"{self.agent_id}_{tool_name}_{next(_tool_call_seq)}_{time.monotonic_ns()}"
+        )
 
         await self._emit_event(
             EventType.TOOL_CALL_START,
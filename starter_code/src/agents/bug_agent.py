@@ -9,15 +9,69 @@ Stage 4 compatible:
 - Integrates with SharedContext
 """
 
-from typing import Any, Dict, List, Optional
-import json
-import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from functools import cached_property
+import asyncio
+import hashlib
 
 from .base_agent import BaseAgent
-from ..llm.openai_client import OpenAIClient
+from ..cache import SemanticCache, TTLCache
+from ..config import config
+from ..llm.batching import batched
+from ..llm.json_extract import JsonArrayStream, extract_json_array
 from ..context.shared_context import SharedContext
 
 
+# Receives each finding as soon as it has been parsed
+FindingCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+_SYSTEM_PROMPT = (
+    "You are a software bug detection agent.\n"
+    "Your task is to identify real, high-confidence bugs,\n"
+    "logic errors, and runtime issues in Python code.\n\n"
+    "Focus on:\n"
+    "- Null/None errors\n"
+    "- Off-by-one mistakes\n"
+    "- Unhandled exceptions\n"
+    "- Resource leaks\n"
+    "- Type errors\n"
+    "- Logic flaws\n"
+    "- Index errors\n"
+    "- Infinite loops\n\n"
+    "Output Rules:\n"
+    "- Return ONLY valid JSON\n"
+    "- No explanations\n"
+    "- No markdown\n"
+    "- Output must start with [ and end with ]\n\n"
+    "If no issues exist, return: []"
+)
+
+# Everything before the code; the code is appended once per request
+_USER_PROMPT_PREFIX = """
+Analyze the following Python code for bugs and logic errors.
+
+Return a JSON array. Each item must have exactly this format:
+
+{
+  "id": "string",
+  "category": "logic|runtime|performance|type|resource",
+  "severity": "critical|high|medium|low",
+  "description": "string",
+  "line": number | null
+}
+
+Rules:
+- Do not add explanations
+- Do not add comments
+- Do not wrap in markdown
+- Do not output anything except JSON
+
+If there are no issues, return [].
+
+CODE:
+"""
+
+
 class BugAgent(BaseAgent):
     """Agent responsible for detecting bugs and logic errors."""
 
@@ -29,7 +83,8 @@ class BugAgent(BaseAgent):
             event_bus=event_bus,
         )
 
-        self._llm = OpenAIClient()
+        # Exact-match cache for this process, checked first
+        self._memo = TTLCache(maxsize=1024, ttl=3600)
 
     # ------------------------------------------------------------------
     # System Prompt
@@ -37,36 +92,26 @@ class BugAgent(BaseAgent):
 
     @property
     def system_prompt(self) -> str:
-        return (
-            "You are a software bug detection agent.\n"
-            "Your task is to identify real, high-confidence bugs,\n"
-            "logic errors, and runtime issues in Python code.\n\n"
-            "Focus on:\n"
-            "- Null/None errors\n"
-            "- Off-by-one mistakes\n"
-            "- Unhandled exceptions\n"
-            "- Resource leaks\n"
-            "- Type errors\n"
-            "- Logic flaws\n"
-            "- Index errors\n"
-            "- Infinite loops\n\n"
-            "Output Rules:\n"
-            "- Return ONLY valid JSON\n"
-            "- No explanations\n"
-            "- No markdown\n"
-            "- Output must start with [ and end with ]\n\n"
-            "If no issues exist, return: []"
-        )
+        return _SYSTEM_PROMPT
 
     # ------------------------------------------------------------------
     # Prompt Builder
     # ------------------------------------------------------------------
 
     def _build_user_prompt(self, code: str) -> str:
+        return _USER_PROMPT_PREFIX + code + "\n"
+
+    def _build_batch_prompt(self, codes: List[str]) -> str:
+        snippets = "\n\n".join(
+            f"SNIPPET {i}:\n{code}" for i, code in enumerate(codes)
+        )
+
         return f"""
-Analyze the following Python code for bugs and logic errors.
+Analyze each of the following {len(codes)} Python code snippets for bugs and logic errors.
 
-Return a JSON array. Each item must have exactly this format:
+Return a JSON array with exactly {len(codes)} elements, one per snippet, in order.
+Each element is a JSON array of findings for that snippet ([] if it has no issues).
+Each finding must have exactly this format:
 
 {{
   "id": "string",
@@ -76,16 +121,15 @@ Return a JSON array. Each item must have exactly this format:
   "line": number | null
 }}
 
+Line numbers are relative to the start of each snippet.
+
 Rules:
 - Do not add explanations
 - Do not add comments
 - Do not wrap in markdown
 - Do not output anything except JSON
 
-If there are no issues, return [].
-
-CODE:
-{code}
+{snippets}
 """
 
     # ------------------------------------------------------------------
@@ -96,22 +140,177 @@ CODE:
         """
         Extract first JSON array from LLM output.
         """
+        return extract_json_array(text)
+
+    # ------------------------------------------------------------------
+    # Detection
+    # ------------------------------------------------------------------
+
+    @batched(max_batch_size=config.llm_batch_max_size, wait_ms=config.llm_batch_wait_ms)
+    async def _detect_bugs(
+        self,
+        requests: List[Tuple[str, FindingCallback]],
+    ) -> List[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """
+        Run bug detection on one or more snippets.
+
+        Concurrent callers are coalesced by @batched: each awaits
+        ``self._detect_bugs((code, on_finding))`` and several snippets go
+        out as one request. Findings are parsed from the stream and
+        passed to the snippet's ``on_finding`` as soon as they are
+        complete. Snippets the batched response does not cover are
+        retried on their own.
+
+        Returns:
+            (findings, parse_error) per snippet
+        """
+        if len(requests) == 1:
+            return [await self._detect_single(*requests[0])]
+
+        stream = JsonArrayStream()
+        per_snippet: List[List[Dict[str, Any]]] = []
+        aligned = True
+
+        async def on_chunk(chunk: str) -> None:
+            nonlocal aligned
+
+            for findings in stream.feed(chunk):
+                if not aligned or len(per_snippet) == len(requests):
+                    return
+
+                if not isinstance(findings, list):
+                    aligned = False
+                    return
+
+                on_finding = requests[len(per_snippet)][1]
+                findings = [f for f in findings if isinstance(f, dict)]
+                per_snippet.append(findings)
+
+                for finding in findings:
+                    await on_finding(finding)
+
+        await self._call_llm(self._build_batch_prompt(
+            [code for code, _ in requests]
+        ), on_chunk=on_chunk)
+
+        results = [(findings, None) for findings in per_snippet]
+        missing = requests[len(per_snippet):]
+
+        if missing:
+            results.extend(await asyncio.gather(
+                *(self._detect_single(code, on_finding) for code, on_finding in missing)
+            ))
+
+        return results
+
+    async def _detect_single(
+        self,
+        code: str,
+        on_finding: FindingCallback,
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Run bug detection on a single snippet."""
+        stream = JsonArrayStream()
+        streamed: List[Dict[str, Any]] = []
+
+        async def on_chunk(chunk: str) -> None:
+            for finding in stream.feed(chunk):
+                if isinstance(finding, dict):
+                    streamed.append(finding)
+                    await on_finding(finding)
+
+        raw_response = await self._call_llm(
+            self._build_user_prompt(code), on_chunk=on_chunk
+        )
 
-        # Fast path
         try:
-            parsed = json.loads(text)
-            if isinstance(parsed, list):
-                return parsed
-        except Exception:
-            pass
+            # Same filter as the stream, so the prefix below lines up
+            findings: List[Dict[str, Any]] = [
+                finding for finding in self._extract_json_array(raw_response)
+                if isinstance(finding, dict)
+            ]
 
-        # Fallback
-        match = re.search(r"\[.*\]", text, re.DOTALL)
+        except Exception as e:
+            # Keep whatever was streamed before the response went bad
+            return streamed, (
+                f"BugAgent failed to parse LLM JSON: {e}. "
+                f"Raw response: {raw_response[:300]}"
+            )
 
-        if not match:
-            raise ValueError("No JSON array found in response")
+        # The stream parser saw the same array and skipped the same
+        # non-dict elements, so streamed findings are a prefix of the list
+        for finding in findings[len(streamed):]:
+            await on_finding(finding)
 
-        return json.loads(match.group())
+        return streamed + findings[len(streamed):], None
+
+    # ------------------------------------------------------------------
+    # Caching
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def _cache(self) -> SemanticCache:
+        """
+        Findings cache shared across runs, opened on first lookup so
+        agents that never analyze code never touch the database.
+        """
+        return SemanticCache(
+            config.findings_cache_path,
+            ttl_seconds=config.findings_cache_ttl_seconds,
+        )
+
+    @cached_property
+    def _cache_namespace(self) -> str:
+        """
+        Cache namespace: agent type plus a digest of the prompts, so
+        prompt changes never serve findings produced by an older prompt.
+        """
+        prompt_digest = hashlib.blake2b(
+            (self.system_prompt + self._build_user_prompt("")).encode("utf-8"),
+            digest_size=8,
+        ).hexdigest()
+        return f"{self.agent_type}:{prompt_digest}"
+
+    def _memo_key(self, code: str) -> bytes:
+        """Exact-match cache key for ``code``."""
+        return hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest()
+
+    def _cache_lookup(self, code: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up findings in the in-process cache, then the persistent one.
+
+        Returns copies so callers cannot mutate cached findings.
+        """
+        key = self._memo_key(code)
+        cached = self._memo.get(key)
+
+        if cached is None:
+            cached = self._cache.get(self._cache_namespace, code)
+
+            if cached is None:
+                return None
+
+            self._memo.set(key, cached)
+
+        return [dict(f) for f in cached]
+
+    def _cache_store(self, code: str, findings: List[Dict[str, Any]]) -> None:
+        """Store findings in both cache layers."""
+        snapshot = [dict(f) for f in findings]
+        self._memo.set(self._memo_key(code), snapshot)
+        self._cache.put(self._cache_namespace, code, snapshot)
+
+    async def _publish_findings(
+        self,
+        findings: List[Dict[str, Any]],
+        shared_context: Optional[SharedContext],
+    ) -> None:
+        """Emit findings and store them in SharedContext."""
+        for finding in findings:
+
+            await self._emit_finding(finding)
+
+            if shared_context:
+                shared_context.add_finding(finding)
 
     # ------------------------------------------------------------------
     # Main Analysis
@@ -132,45 +331,39 @@ CODE:
         if context and "shared_context" in context:
             shared_context = context["shared_context"]
 
-        await self._emit_thinking("Analyzing code for bugs and logic flaws")
-
-        user_prompt = self._build_user_prompt(code)
+        # Callers can opt out of caching with {"no_cache": True}
+        use_cache = not (context and context.get("no_cache"))
 
-        raw_response = await self._llm.generate(
-            system_prompt=self.system_prompt,
-            user_prompt=user_prompt,
-        )
-
-        # --------------------------------------------------------------
-        # Parse response safely
-        # --------------------------------------------------------------
+        cached = self._cache_lookup(code) if use_cache else None
 
-        try:
-            findings: List[Dict[str, Any]] = self._extract_json_array(
-                raw_response
+        if cached is not None:
+            await self._emit_thinking("Reusing cached findings for this code")
+            await self._publish_findings(cached, shared_context)
+            await self._emit_agent_completed(
+                summary=f"Found {len(cached)} bug(s) (cached)"
             )
+            return {
+                "findings": cached,
+            }
 
-        except Exception as e:
-            await self._emit_error(
-                f"BugAgent failed to parse LLM JSON: {e}. "
-                f"Raw response: {raw_response[:300]}",
-                recoverable=False,
-            )
-            findings = []
-
-        # --------------------------------------------------------------
-        # Post-process findings
-        # --------------------------------------------------------------
-
-        for finding in findings:
+        await self._emit_thinking("Analyzing code for bugs and logic flaws")
 
+        async def on_finding(finding: Dict[str, Any]) -> None:
             finding["agent_id"] = self.agent_id
             finding["agent_type"] = self.agent_type
+            await self._publish_findings([finding], shared_context)
 
-            await self._emit_finding(finding)
+        # Findings are published as they stream in
+        findings, parse_error = await self._detect_bugs((code, on_finding))
 
-            if shared_context:
-                shared_context.add_finding(finding)
+        parsed = parse_error is None
+
+        if parse_error:
+            await self._emit_error(parse_error, recoverable=False)
+
+        # Only cache successfully parsed responses
+        if parsed and use_cache:
+            self._cache_store(code, findings)
 
         await self._emit_agent_completed(
             summary=f"Found {len(findings)} bug(s)"
@@ -18,13 +18,54 @@ from ..events import EventBus, EventType, Event
 
 
 import asyncio
-import json
-from typing import Dict, Any, List, Set
+import copy
+from typing import Dict, Any, List
 
 from .base_agent import BaseAgent
 from ..events import EventType
-from ..llm.openai_client import OpenAIClient
+from ..cache import TTLCache, content_key
+from ..llm.fusion import LLMFuser, current_fuser
+from ..llm.json_extract import JsonArrayStream, loads
+from ..planning.scheduler import StepScheduler
+from ..tools import CodeContext
+from .task_queue import TaskQueue
+
+
+_SYSTEM_PROMPT = (
+    "You are a coordination and planning agent.\n"
+    "Your task is to analyze code review requests and\n"
+    "break them into structured analysis steps.\n\n"
+    "You create execution plans for specialist agents."
+)
+
+# Everything before the code; the code is appended once per request
+_PLAN_PROMPT_PREFIX = """
+Analyze the following code review task and create an execution plan.
+
+Return STRICTLY valid JSON in this format:
+
+{
+  "plan_id": "string",
+  "steps": [
+    {
+      "step_id": "string",
+      "agent_type": "security|bug",
+      "description": "string",
+      "depends_on": [],
+      "can_run_parallel": true,
+      "timeout_seconds": 60
+    }
+  ]
+}
+
+Rules:
+- Do not add explanations
+- Do not add markdown
+- Do not add extra text
+- Output must be JSON only
 
+CODE:
+"""
 
 
 class CoordinatorAgent(BaseAgent):
@@ -43,12 +84,19 @@ class CoordinatorAgent(BaseAgent):
             event_bus=event_bus,
         )
 
-        # LLM client for planning
-        self._llm = OpenAIClient()
-
         # Maps agent_type -> agent instance
         self._specialists: Dict[str, BaseAgent] = {}
 
+        # Caps concurrently running specialists so bursts queue here
+        # instead of hitting provider rate limits and retrying
+        self._llm_sem = asyncio.Semaphore(config.max_concurrent_llm_calls or 8)
+
+        # Reviews started with {"async_mode": True}
+        self._tasks = TaskQueue()
+
+        # Plans keyed by code + analysis options
+        self._plan_cache = TTLCache(maxsize=256, ttl=3600)
+
 
 
         # ---------------------------------------------------------
@@ -57,18 +105,16 @@ class CoordinatorAgent(BaseAgent):
 
     @property
     def system_prompt(self) -> str:
-        return (
-            "You are a coordination and planning agent.\n"
-            "Your task is to analyze code review requests and\n"
-            "break them into structured analysis steps.\n\n"
-            "You create execution plans for specialist agents."
-        )
+        return _SYSTEM_PROMPT
 
 
         # ---------------------------------------------------------
         # LLM-Based Planner
         # ---------------------------------------------------------
 
+    def _build_plan_prompt(self, code: str) -> str:
+        return _PLAN_PROMPT_PREFIX + code + "\n"
+
     async def _plan_with_llm(
             self,
             code: str,
@@ -76,47 +122,79 @@ class CoordinatorAgent(BaseAgent):
     ) -> Dict[str, Any]:
         """
         Generate execution plan using LLM.
+
+        Only used when the streamed plan in _plan_and_execute yields no
+        steps; a cold run normally makes one streamed, unhedged request.
         """
+        return await self._plan_hedged(code, context, k=config.plan_hedge_count)
 
-        system_prompt = self.system_prompt
+    async def _plan_hedged(
+        self,
+        code: str,
+        context: Dict[str, Any],
+        k: int = 2,
+    ) -> Dict[str, Any]:
+        """
+        Request ``k`` plans concurrently and keep the first valid one.
 
-        user_prompt = f"""
-Analyze the following code review task and create an execution plan.
+        Remaining requests are cancelled as soon as a plan validates, so
+        a slow or malformed response no longer sets the planning latency.
+        Only the first request streams its output as thinking events.
 
-Return STRICTLY valid JSON in this format:
+        Raises:
+            RuntimeError: If none of the ``k`` responses is a valid plan
+        """
+        user_prompt = self._build_plan_prompt(code)
 
-{{
-  "plan_id": "string",
-  "steps": [
-    {{
-      "step_id": "string",
-      "agent_type": "security|bug",
-      "description": "string",
-      "depends_on": [],
-      "can_run_parallel": true,
-      "timeout_seconds": 60
-    }}
-  ]
-}}
+        pending = {
+            asyncio.create_task(self._plan_attempt(user_prompt, stream_thinking=(i == 0)))
+            for i in range(max(1, k))
+        }
+        errors: List[str] = []
 
-Rules:
-- Do not add explanations
-- Do not add markdown
-- Do not add extra text
-- Output must be JSON only
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
 
-CODE:
-{code}
-"""
+                for finished in done:
+                    try:
+                        return finished.result()
+                    except Exception as e:
+                        errors.append(str(e))
+
+        finally:
+            for task in pending:
+                task.cancel()
 
-        raw_response = await self._llm.generate(
-            system_prompt=system_prompt,
-            user_prompt=user_prompt,
+        raise RuntimeError(
+            f"Failed to produce a valid plan in {len(errors)} attempt(s): "
+            + "; ".join(errors)
         )
 
-        # Safe parse
+    async def _plan_attempt(
+        self,
+        user_prompt: str,
+        stream_thinking: bool,
+    ) -> Dict[str, Any]:
+        """
+        Run one planning request and validate the result.
+        """
+        raw_response = await self._call_llm(user_prompt, stream_thinking=stream_thinking)
+
+        return self._parse_plan(raw_response)
+
+    def _parse_plan(self, raw_response: str) -> Dict[str, Any]:
+        """
+        Parse and validate a plan response.
+
+        Raises:
+            RuntimeError: If the response is not a valid plan
+        """
         try:
-            plan = json.loads(raw_response)
+            plan = loads(raw_response)
 
         except Exception as e:
             raise RuntimeError(
@@ -124,8 +202,38 @@ CODE:
                 f"Response: {raw_response[:300]}"
             )
 
+        self._validate_plan(plan)
+
         return plan
 
+    def _validate_plan(self, plan: Any) -> None:
+        """
+        Check the plan has the fields the scheduler relies on.
+
+        Raises:
+            RuntimeError: If the plan is malformed
+        """
+        if not isinstance(plan, dict) or "plan_id" not in plan:
+            raise RuntimeError("Plan must be an object with a plan_id")
+
+        steps = plan.get("steps")
+
+        if not isinstance(steps, list):
+            raise RuntimeError("Plan steps must be a list")
+
+        for step in steps:
+            if not self._is_valid_step(step):
+                raise RuntimeError(f"Malformed plan step: {step}")
+
+    def _is_valid_step(self, step: Any) -> bool:
+        """Whether a step has the fields the scheduler relies on."""
+        return (
+            isinstance(step, dict)
+            and "step_id" in step
+            and "agent_type" in step
+            and isinstance(step.get("depends_on", []), list)
+        )
+
 
     def register_specialist(self, agent_type: str, agent: BaseAgent) -> None:
         """
@@ -165,24 +273,28 @@ CODE:
         """
         Main coordinator entry.
 
-        1. Create plan
+        1. Create plan (streamed; steps start while planning continues)
         2. Execute plan
         3. Return results
+
+        With ``{"async_mode": True}`` the review runs in the background
+        and ``{"task_id", "status": "queued"}`` is returned at once; poll
+        it with ``get_task``.
         """
+        if context.get("async_mode"):
+            task_id = self._tasks.submit(
+                self.analyze(code, {**context, "async_mode": False})
+            )
+            return {"task_id": task_id, "status": "queued"}
 
         await self._emit_agent_started("Creating analysis plan")
 
-        # Step 1: Create plan (existing logic)
-        plan = await self._create_plan(code, context)
+        # Hash, split and parse the code once for every specialist
+        if CodeContext.of(code, context) is None:
+            context = {**context, "code_ctx": CodeContext.build(code)}
 
-        # Step 2: Emit plan created
-        await self._emit_event(
-            EventType.PLAN_CREATED,
-            plan,
-        )
-
-        # Step 3: Execute plan automatically
-        await self._execute_plan(plan, code, context)
+        # Plan, executing steps as soon as the planner emits them
+        await self._plan_and_execute(code, context)
 
         # Consolidate results
         report = self._consolidate_results(context)
@@ -193,121 +305,165 @@ CODE:
 
         return report
 
-        return plan
+    def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Status of a background review; includes the report once completed.
+        """
+        return self._tasks.status(task_id)
 
     # ---------------------------------------------------------
     # Planning (Existing Logic Wrapper)
     # ---------------------------------------------------------
 
-    async def _create_plan(
+    async def _plan_and_execute(
         self,
         code: str,
         context: Dict[str, Any],
     ) -> Dict[str, Any]:
         """
-        Wrapper around existing planning logic.
-        """
+        Create the plan and execute it, overlapping the two.
 
-        # Call your existing LLM-based planner
-        return await self._plan_with_llm(code, context)
+        The planning response is streamed and every step is handed to
+        the scheduler as soon as its JSON object is complete, so steps
+        with no dependencies start while the planner is still writing.
+        plan_created is emitted once the full plan is known.
 
-    # ---------------------------------------------------------
-    # Scheduler / Executor
-    # ---------------------------------------------------------
+        If streaming yields no usable steps, planning falls back to
+        _create_plan (hedged). If the response breaks after some steps
+        already started, the plan continues with those steps. Streamed
+        steps run individually; step fusion only applies to cached and
+        fallback plans, which go through _execute_plan.
 
-    async def _execute_plan(
-        self,
-        plan: Dict[str, Any],
-        code: str,
-        context: Dict[str, Any],
-    ) -> None:
-        """
-        Execute plan with dependency-aware scheduling.
+        Plans are cached per code and analysis options
+        (``context["options"]``); pass ``{"no_cache": True}`` to skip.
         """
+        use_cache = not context.get("no_cache")
+        cache_key = content_key(code, self.agent_type, context.get("options"))
 
-        steps: List[Dict[str, Any]] = plan.get("steps", [])
+        cached = self._plan_cache.get(cache_key) if use_cache else None
 
-        # Track completed steps
-        completed: Set[str] = set()
+        if cached is not None:
+            plan = copy.deepcopy(cached)
+            await self._emit_event(EventType.PLAN_CREATED, plan)
+            await self._execute_plan(plan, code, context)
+            return plan
 
-        # Track running tasks
-        running: Dict[str, asyncio.Task] = {}
+        scheduler = StepScheduler(lambda step: self._run_step(step, code, context))
+        stream = JsonArrayStream(key="steps")
 
-        while len(completed) < len(steps):
+        async def on_chunk(chunk: str) -> None:
+            for step in stream.feed(chunk):
+                if self._is_valid_step(step):
+                    scheduler.add(step)
 
-            # Find steps ready to run
-            ready_steps = self._find_ready_steps(
-                steps,
-                completed,
-                running,
-            )
+        runner = asyncio.create_task(scheduler.run())
 
-            # Schedule ready steps
-            for step in ready_steps:
-                task = asyncio.create_task(
-                    self._run_step(step, code, context)
+        try:
+            try:
+                raw_response = await self._call_llm(
+                    self._build_plan_prompt(code), on_chunk=on_chunk
+                )
+                plan = self._parse_plan(raw_response)
+
+            except Exception as e:
+                if not scheduler.started:
+                    runner.cancel()
+                    plan = await self._create_plan(code, context)
+                    await self._emit_event(EventType.PLAN_CREATED, plan)
+                    await self._execute_plan(plan, code, context)
+                    return plan
+
+                await self._emit_error(
+                    f"Plan stream failed after steps started: {e}. "
+                    f"Continuing with {len(scheduler.steps)} streamed step(s)",
+                    recoverable=True,
                 )
+                plan = {"plan_id": None, "steps": scheduler.steps}
+                use_cache = False
 
-                running[step["step_id"]] = task
+            # Steps the stream parser did not pick up (duplicates are ignored)
+            for step in plan["steps"]:
+                scheduler.add(step)
 
-            if not running:
-                raise RuntimeError("Deadlock detected in plan execution")
+            scheduler.close()
 
-            # Wait for any step to complete
-            done, _ = await asyncio.wait(
-                running.values(),
-                return_when=asyncio.FIRST_COMPLETED,
-            )
+            if use_cache:
+                self._plan_cache.set(cache_key, copy.deepcopy(plan))
 
-            # Process completed tasks
-            for finished in done:
+            await self._emit_event(EventType.PLAN_CREATED, plan)
 
-                step_id = None
+            await runner
 
-                for sid, task in running.items():
-                    if task == finished:
-                        step_id = sid
-                        break
+            return plan
 
-                if step_id is None:
-                    continue
+        finally:
+            # Cancellation or an error must not leave streamed steps running
+            if not runner.done():
+                runner.cancel()
 
-                await finished  # propagate errors
+    async def _create_plan(
+        self,
+        code: str,
+        context: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """
+        Wrapper around the hedged (non-streamed) planner.
+        """
+        plan = await self._plan_with_llm(code, context)
 
-                completed.add(step_id)
-                del running[step_id]
+        if not context.get("no_cache"):
+            self._plan_cache.set(
+                content_key(code, self.agent_type, context.get("options")),
+                copy.deepcopy(plan),
+            )
+
+        return plan
 
     # ---------------------------------------------------------
-    # Step Selection
+    # Scheduler / Executor
     # ---------------------------------------------------------
 
-    def _find_ready_steps(
+    async def _execute_plan(
         self,
-        steps: List[Dict[str, Any]],
-        completed: Set[str],
-        running: Dict[str, asyncio.Task],
-    ) -> List[Dict[str, Any]]:
-        """
-        Find steps whose dependencies are satisfied.
+        plan: Dict[str, Any],
+        code: str,
+        context: Dict[str, Any],
+    ) -> None:
         """
+        Execute plan with dependency-aware scheduling.
 
-        ready = []
+        Root steps that may run in parallel on different specialists
+        share a fuser, so their first LLM calls go out as one request.
+        """
+        roots = [
+            step for step in plan.get("steps", [])
+            if not step.get("depends_on") and step.get("can_run_parallel", True)
+            and step.get("agent_type") in self._specialists
+        ]
+        fused_ids = set()
+        fuser = None
+
+        if config.fuse_parallel_steps and len({s["agent_type"] for s in roots}) >= 2:
+            fuser = LLMFuser(
+                self._llm, code, expected=len(roots), wait_ms=config.llm_fusion_wait_ms
+            )
+            fused_ids = {step["step_id"] for step in roots}
 
-        for step in steps:
+        async def run_step(step: Dict[str, Any]) -> None:
+            # Each step runs in its own task, so this only affects this step
+            if step["step_id"] in fused_ids:
+                current_fuser.set(fuser)
 
-            step_id = step["step_id"]
+            await self._run_step(step, code, context)
 
-            # Skip finished or running
-            if step_id in completed or step_id in running:
-                continue
+        scheduler = StepScheduler(run_step)
 
-            deps = step.get("depends_on", [])
+        for step in plan.get("steps", []):
+            scheduler.add(step)
 
-            # Check dependencies
-            if all(dep in completed for dep in deps):
-                ready.append(step)
+        scheduler.close()
 
-        return ready
+        await scheduler.run()
 
     # ---------------------------------------------------------
     # Step Runner
@@ -341,8 +497,22 @@ CODE:
         if not agent:
             raise RuntimeError(f"No specialist for {agent_type}")
 
-        # Run specialist
-        await agent.analyze(code, context)
+        # Run specialist, bounded by the step timeout so one slow
+        # LLM call cannot hold up the whole review. Time spent waiting
+        # for a slot does not count against the timeout.
+        timeout = step.get("timeout_seconds") or config.step_timeout_seconds
+        status = "completed"
+
+        try:
+            async with self._llm_sem:
+                await asyncio.wait_for(agent.analyze(code, context), timeout=timeout)
+
+        except asyncio.TimeoutError:
+            status = "timed_out"
+            await self._emit_error(
+                f"Step {step_id} ({agent_type}) timed out after {timeout}s",
+                recoverable=True,
+            )
 
         # Emit step completed
         await self._emit_event(
@@ -350,6 +520,7 @@ CODE:
             {
                 "step_id": step_id,
                 "agent_type": agent_type,
+                "status": status,
             },
         )
 
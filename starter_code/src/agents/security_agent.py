@@ -10,14 +10,323 @@ Stage 3B implemented:
 - Safely extracts JSON from LLM responses
 """
 
-from typing import Any, Dict, List, Optional
-import json
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import ast
+import asyncio
+import math
 import re
 
 from .base_agent import BaseAgent
-from ..llm.openai_client import OpenAIClient
+from ..cache import TTLCache, content_key
+from ..config import config
+from ..llm.json_extract import JsonArrayStream, extract_json_array
 from ..context.shared_context import SharedContext
 from ..events import EventType
+from ..tools import CodeContext
+
+
+# Receives each finding as soon as it has been parsed
+FindingCallback = Callable[[Dict[str, Any]], Awaitable[None]]
+
+# Well-known API token prefixes (OpenAI, Stripe, SendGrid, Google OAuth,
+# GitHub, Slack); case-sensitive, followed by the token body
+_SECRET_PREFIXES = (
+    "sk-proj-", "sk_live_", "rk_live_", "whsec_", "SG.", "GOCSPX-",
+    "ghp_", "gho_", "github_pat_", "xoxb-", "xoxp-", "Iv1.",
+)
+_SECRET_TOKEN = (
+    "(?-i:(?:" + "|".join(map(re.escape, _SECRET_PREFIXES)) + r")[A-Za-z0-9_/+\-.]{16,})"
+)
+
+# Anything that could lead to a finding in the agent's focus areas.
+# Code matching none of these skips the LLM call; keep it conservative,
+# a false positive only costs one request. Used as-is only for code that
+# does not parse; see _has_risky_sinks.
+_SINK_RE = re.compile(
+    r"""
+    \b(?:eval|exec|compile|__import__|execute|executemany|executescript|raw|extra)\s*\(  # code / SQL execution
+    | \bimportlib\b | import\s+\*                                                      # dynamic / star imports
+    | \b(?:os\.(?:system|popen|exec\w*|spawn\w*)|subprocess|commands\.|pty\.spawn)     # command execution
+    | shell\s*=\s*True
+    | \b(?:pickle|cPickle|dill|marshal|shelve|jsonpickle)\b                             # unsafe deserialization
+    | \byaml\.(?:load|unsafe_load|full_load)\b
+    | \b(?:SELECT|INSERT|UPDATE|DELETE|DROP|UNION)\b                                    # SQL text
+    | \bhashlib\.(?:md5|sha1)\b
+    | AKIA[0-9A-Z]{16}                                                                 # AWS access key id
+    | -----BEGIN\ [A-Z\ ]*PRIVATE\ KEY-----
+    | <[a-z][\w-]*[\s/>] | \b(?:Markup|mark_safe|render_template_string)\b             # HTML output (XSS)
+    | (?:password|passwd|pwd|secret|token|api_?key|private_?key|credential)\w*\s*[:=]\s*[rbuf]?['"]
+    | \b\w*(?:auth|login|logout|session|jwt|permission|privilege|admin|role|csrf)\w*\b   # authn / authz logic
+    | """ + _SECRET_TOKEN,
+    re.IGNORECASE | re.VERBOSE,
+)
+
+# AST prefilter: the same sinks as _SINK_RE, matched on syntax so that
+# comments and docstrings mentioning them do not count
+_EXEC_CALLS = frozenset({
+    "eval", "exec", "compile", "__import__",
+    "execute", "executemany", "executescript", "raw", "extra",
+    "Markup", "mark_safe", "render_template_string",
+})
+_RISKY_MODULES = frozenset({
+    "subprocess", "commands", "pty", "importlib",
+    "pickle", "cPickle", "dill", "marshal", "shelve", "jsonpickle",
+})
+_RISKY_QUALIFIED = re.compile(
+    r"^(?:os\.(?:system|popen|exec\w*|spawn\w*)"
+    r"|yaml\.(?:load|unsafe_load|full_load)|hashlib\.(?:md5|sha1))$"
+)
+# getattr() on these can reach a sink by a computed name
+_DYNAMIC_LOOKUP_MODULES = frozenset({"os", "yaml", "hashlib", "builtins"})
+_STRING_SINK_RE = re.compile(
+    r"\b(?:SELECT|INSERT|UPDATE|DELETE|DROP|UNION)\b|AKIA[0-9A-Z]{16}|PRIVATE KEY-----"
+    r"|<[a-z][\w-]*[\s/>]"  # HTML markup (XSS)
+    "|" + _SECRET_TOKEN,
+    re.IGNORECASE,
+)
+_SECRET_NAME_RE = re.compile(
+    r"password|passwd|pwd|secret|token|api_?key|private_?key|credential", re.IGNORECASE
+)
+_AUTH_NAME_RE = re.compile(
+    r"auth|login|logout|session|jwt|permission|privilege|admin|role|csrf", re.IGNORECASE
+)
+
+
+def _dotted_name(node: ast.AST) -> str:
+    """``a.b.c`` for Name/Attribute chains, else the last attribute."""
+    parts = []
+
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+
+    return ".".join(reversed(parts))
+
+
+def _bind_import(node: ast.AST, aliases: Dict[str, str]) -> None:
+    """Record the names an import statement binds, as qualified names."""
+    if isinstance(node, ast.Import):
+        for alias in node.names:
+            if alias.asname:
+                aliases[alias.asname] = alias.name
+            else:
+                head = alias.name.partition(".")[0]
+                aliases[head] = head
+
+    elif isinstance(node, ast.ImportFrom) and node.module:
+        for alias in node.names:
+            aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+
+
+def _import_aliases(tree: ast.AST) -> Optional[Dict[str, str]]:
+    """
+    Names bound by every import in ``tree``; None if a star import
+    makes them unknowable.
+    """
+    aliases: Dict[str, str] = {}
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            if any(alias.name == "*" for alias in node.names):
+                return None
+
+            _bind_import(node, aliases)
+
+    return aliases
+
+
+def _resolve(name: str, aliases: Dict[str, str]) -> str:
+    """Qualified form of a dotted call name, through import aliases."""
+    head, dot, rest = name.partition(".")
+    return aliases[head] + dot + rest if head in aliases else name
+
+
+def _is_risky_name(name: str) -> bool:
+    return bool(name.partition(".")[0] in _RISKY_MODULES or _RISKY_QUALIFIED.match(name))
+
+
+def _is_risky_call(name: str) -> bool:
+    return name.rpartition(".")[2] in _EXEC_CALLS or _is_risky_name(name)
+
+
+def _entropy(text: str) -> float:
+    """Shannon entropy in bits per character."""
+    counts = Counter(text)
+    return -sum(n / len(text) * math.log2(n / len(text)) for n in counts.values())
+
+
+def _is_secret_literal(target: ast.AST, value: Optional[ast.AST]) -> bool:
+    """A secret-looking name bound to a string literal."""
+    return (
+        isinstance(value, ast.Constant)
+        and isinstance(value.value, str)
+        and bool(_SECRET_NAME_RE.search(_dotted_name(target)))
+    )
+
+
+def _has_risky_sinks(
+    code: str,
+    tree: Optional[ast.AST] = None,
+    aliases: Optional[Dict[str, str]] = None,
+) -> bool:
+    """
+    Whether ``code`` contains anything the security analysis looks for.
+
+    One pass over the syntax tree (parsed here unless ``tree`` is
+    given); code that does not parse falls back to the _SINK_RE text
+    scan. Calls and references are matched after resolving import
+    aliases, so ``from os import system; system(cmd)`` counts like
+    ``os.system(cmd)``; ``aliases`` adds imports made outside ``code``.
+    Whatever cannot be resolved statically (star imports, getattr on
+    os/yaml/hashlib, importlib) counts as risky.
+    """
+    if tree is None:
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError):
+            return _SINK_RE.search(code) is not None
+
+    aliases = dict(aliases or {})
+    called: List[str] = []
+    referenced: List[str] = []
+    stack: List[ast.AST] = [tree]
+
+    while stack:
+        node = stack.pop()
+
+        # Docstrings and other bare string statements never execute
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+            continue
+
+        stack.extend(ast.iter_child_nodes(node))
+
+        if isinstance(node, ast.Call):
+            name = _dotted_name(node.func)
+
+            if _is_risky_call(name):
+                return True
+
+            if (
+                _resolve(name, aliases) == "getattr"
+                and node.args
+                and _resolve(_dotted_name(node.args[0]), aliases).partition(".")[0]
+                in _DYNAMIC_LOOKUP_MODULES
+            ):
+                return True
+
+            called.append(name)
+
+            for keyword in node.keywords:
+                if (
+                    keyword.arg == "shell"
+                    and isinstance(keyword.value, ast.Constant)
+                    and keyword.value.value is True
+                ):
+                    return True
+
+        elif isinstance(node, (ast.Name, ast.Attribute)):
+            # Calls and bare references (f = o.system) alike
+            referenced.append(_dotted_name(node))
+
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            if any(alias.name == "*" for alias in node.names):
+                return True
+
+            _bind_import(node, aliases)
+
+            modules = [alias.name for alias in node.names]
+            if isinstance(node, ast.ImportFrom) and node.module:
+                modules.append(node.module)
+
+            if any(m.partition(".")[0] in _RISKY_MODULES for m in modules):
+                return True
+
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            text = node.value
+
+            if _STRING_SINK_RE.search(text):
+                return True
+
+            # Long random-looking literals are likely keys or tokens
+            if len(text) > 20 and " " not in text and _entropy(text) > 4.0:
+                return True
+
+        elif isinstance(node, ast.Assign):
+            if any(_is_secret_literal(t, node.value) for t in node.targets):
+                return True
+
+        elif isinstance(node, ast.AnnAssign):
+            if _is_secret_literal(node.target, node.value):
+                return True
+
+        elif isinstance(node, ast.keyword):
+            if node.arg and _is_secret_literal(ast.Name(node.arg), node.value):
+                return True
+
+        elif isinstance(node, ast.Dict):
+            for key, value in zip(node.keys, node.values):
+                if (
+                    isinstance(key, ast.Constant)
+                    and isinstance(key.value, str)
+                    and _is_secret_literal(ast.Name(key.value), value)
+                ):
+                    return True
+
+        # Authentication / authorization logic
+        name = (
+            getattr(node, "id", None)
+            or getattr(node, "attr", None)
+            or getattr(node, "arg", None)
+            or (node.name if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) else None)
+        )
+        if isinstance(name, str) and _AUTH_NAME_RE.search(name):
+            return True
+
+    # Checked once all imports are known
+    return any(
+        _is_risky_call(_resolve(name, aliases)) for name in called
+    ) or any(
+        _is_risky_name(_resolve(name, aliases)) for name in referenced
+    )
+
+
+_SYSTEM_PROMPT = (
+    "You are a security analysis system for Python code.\n"
+    "Your task is to identify real, high-confidence security issues.\n\n"
+    "Focus ONLY on:\n"
+    "- SQL injection\n"
+    "- Command injection\n"
+    "- Hardcoded secrets\n"
+    "- Unsafe deserialization\n"
+    "- Authentication / authorization flaws\n\n"
+    "Return a JSON array. Each item must have exactly this format:\n\n"
+    "{\n"
+    '  "id": "string",\n'
+    '  "category": "string",\n'
+    '  "severity": "critical|high|medium|low",\n'
+    '  "description": "string",\n'
+    '  "line": number | null\n'
+    "}\n\n"
+    "Output Rules:\n"
+    "- Return ONLY valid JSON\n"
+    "- No explanations\n"
+    "- No comments\n"
+    "- No markdown\n"
+    "- No extra text\n"
+    "- Output must start with [ and end with ]\n\n"
+    "If no issues exist, return: []"
+)
+
+_REQUIRED_FINDING_KEYS = frozenset(("id", "category", "severity", "description", "line"))
+
+# Everything before the code. All instructions live in the system
+# prompt, so the request is byte-identical up to the code and the
+# provider's prompt cache covers everything but the code itself.
+_USER_PROMPT_PREFIX = "Analyze the following Python code for security vulnerabilities.\n\nCODE:\n"
 
 
 class SecurityAgent(BaseAgent):
@@ -30,7 +339,9 @@ class SecurityAgent(BaseAgent):
             agent_config={},
             event_bus=event_bus,
         )
-        self._llm = OpenAIClient()
+
+        # Findings keyed by code + analysis options
+        self._findings_cache = TTLCache(maxsize=1024, ttl=3600)
 
     # ------------------------------------------------------------------
     # Prompting
@@ -38,110 +349,155 @@ class SecurityAgent(BaseAgent):
 
     @property
     def system_prompt(self) -> str:
-        return (
-            "You are a security analysis system for Python code.\n"
-            "Your task is to identify real, high-confidence security issues.\n\n"
-            "Focus ONLY on:\n"
-            "- SQL injection\n"
-            "- Command injection\n"
-            "- Hardcoded secrets\n"
-            "- Unsafe deserialization\n"
-            "- Authentication / authorization flaws\n\n"
-            "Output Rules:\n"
-            "- Return ONLY valid JSON\n"
-            "- No explanations\n"
-            "- No markdown\n"
-            "- No extra text\n"
-            "- Output must start with [ and end with ]\n\n"
-            "If no issues exist, return: []"
-        )
+        return _SYSTEM_PROMPT
 
     def _build_user_prompt(self, code: str) -> str:
         """
         Build user prompt with strict schema.
         """
-        return f"""
-Analyze the following Python code for security vulnerabilities.
+        return _USER_PROMPT_PREFIX + code + "\n"
 
-Return a JSON array. Each item must have exactly this format:
+    # ------------------------------------------------------------------
+    # JSON Extraction
+    # ------------------------------------------------------------------
+
+    def _extract_json_array(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Extract first JSON array from LLM output and validate structure.
 
-{{
-  "id": "string",
-  "category": "string",
-  "severity": "critical|high|medium|low",
-  "description": "string",
-  "line": number | null
-}}
+        Uses the single-pass bracket scanner from llm.json_extract; a
+        response that is already a bare array is parsed directly.
+        """
+        return self._validate_findings(extract_json_array(text))
 
-Rules:
-- Do not add explanations
-- Do not add comments
-- Do not wrap in markdown
-- Do not output anything except JSON
+    def _validate_findings(self, findings: list) -> List[Dict[str, Any]]:
+        """
+        Validate structure of security findings.
+        """
 
-If there are no issues, return [].
+        required = _REQUIRED_FINDING_KEYS.issubset
 
-CODE:
-{code}
-"""
+        return [
+            item for item in findings
+            if isinstance(item, dict) and required(item)
+        ]
 
     # ------------------------------------------------------------------
-    # JSON Extraction
+    # Chunking
     # ------------------------------------------------------------------
 
-    def _extract_json_array(self, text: str) -> List[Dict[str, Any]]:
+    def _split_code(
+        self,
+        code: str,
+        code_ctx: Optional[CodeContext] = None,
+    ) -> List[Tuple[int, str]]:
         """
-        Extract first JSON array from LLM output and validate structure.
+        Split large code at top-level definitions.
+
+        Consecutive top-level statements are packed into chunks of up to
+        ``config.security_chunk_chars``; chunks with no risky sinks are
+        dropped, resolving names through the whole file's imports.
+        Code that is small or does not parse is one chunk.
+        The tree in ``code_ctx`` is reused when given.
+
+        Returns:
+            (line_offset, source) pairs
         """
+        if len(code) <= config.security_chunk_chars:
+            return [(0, code)]
 
-        # Fast path: pure JSON
-        try:
-            parsed = json.loads(text)
-            if isinstance(parsed, list):
-                return self._validate_findings(parsed)
-        except Exception:
-            pass
+        if code_ctx is not None:
+            tree = code_ctx.tree
+        else:
+            try:
+                tree = ast.parse(code)
+            except SyntaxError:
+                tree = None
 
-        # Non-greedy fallback
-        match = re.search(r"\[[\s\S]*?\]", text)
+        if tree is None:
+            return [(0, code)]
 
-        if not match:
-            raise ValueError("No JSON array found in response")
+        lines = code.splitlines(keepends=True)
 
-        parsed = json.loads(match.group())
+        # Each top-level statement starts a segment (decorators included);
+        # the first segment also covers any leading comments
+        starts = sorted({
+            min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])]) - 1
+            for node in tree.body
+        } | {0})
+        bounds = list(zip(starts, starts[1:] + [len(lines)]))
 
-        if not isinstance(parsed, list):
-            raise ValueError("Extracted JSON is not an array")
+        chunks: List[Tuple[int, str]] = []
+        chunk_start, size = 0, 0
 
-        return self._validate_findings(parsed)
+        for begin, end in bounds:
+            segment_size = sum(len(line) for line in lines[begin:end])
 
-    def _validate_findings(self, findings: list) -> List[Dict[str, Any]]:
+            if size and size + segment_size > config.security_chunk_chars:
+                chunks.append((chunk_start, "".join(lines[chunk_start:begin])))
+                chunk_start, size = begin, 0
+
+            size += segment_size
+
+        chunks.append((chunk_start, "".join(lines[chunk_start:])))
+
+        aliases = _import_aliases(tree)
+
+        if aliases is None:
+            return chunks
+
+        return [
+            chunk for chunk in chunks if _has_risky_sinks(chunk[1], aliases=aliases)
+        ] or [(0, code)]
+
+    async def _analyze_chunk(
+        self,
+        line_offset: int,
+        code: str,
+        on_finding: FindingCallback,
+    ) -> Optional[str]:
         """
-        Validate structure of security findings.
+        Analyze one chunk, passing each finding to ``on_finding`` as soon
+        as it has streamed in. Line numbers are shifted to the full file.
+
+        Returns:
+            The parse error, if the full response was not valid JSON
         """
+        stream = JsonArrayStream()
+        streamed = 0
 
-        validated = []
+        async def emit(finding: Dict[str, Any]) -> None:
+            if line_offset and isinstance(finding.get("line"), int):
+                finding["line"] += line_offset
+            await on_finding(finding)
 
-        required_keys = {
-            "id",
-            "category",
-            "severity",
-            "description",
-            "line",
-        }
+        async def on_chunk(chunk: str) -> None:
+            nonlocal streamed
 
-        for item in findings:
-            if not isinstance(item, dict):
-                continue
+            for finding in self._validate_findings(stream.feed(chunk)):
+                streamed += 1
+                await emit(finding)
 
-            missing = required_keys - item.keys()
+        raw_response = await self._call_llm(
+            self._build_user_prompt(code), on_chunk=on_chunk
+        )
 
-            if missing:
-                continue
+        try:
+            findings = self._extract_json_array(raw_response)
+
+        except Exception as e:
+            # Keep whatever was streamed before the response went bad
+            return (
+                f"Failed to parse LLM JSON response: {e}. "
+                f"Raw response: {raw_response[:300]}"
+            )
 
-            validated.append(item)
+        # The stream parser saw the same array and applied the same
+        # validation, so streamed findings are a prefix of the full list
+        for finding in findings[streamed:]:
+            await emit(finding)
 
-        return validated
+        return None
 
     # ------------------------------------------------------------------
     # Main Analysis
@@ -164,44 +520,85 @@ CODE:
         if context and "shared_context" in context:
             shared_context = context["shared_context"]
 
-        await self._emit_thinking("Scanning code for security-sensitive patterns")
-
-        user_prompt = self._build_user_prompt(code)
+        code_ctx = CodeContext.of(code, context)
 
-        raw_response = await self._llm.generate(
-            system_prompt=self.system_prompt,
-            user_prompt=user_prompt,
+        # Prefilter: no risky sinks, nothing for the LLM to find. Aliases
+        # are resolved and anything unresolvable counts as risky
+        if not _has_risky_sinks(code, code_ctx.tree if code_ctx else None):
+            await self._emit_thinking("No security-sensitive patterns found; skipping LLM analysis")
+            await self._emit_agent_completed(
+                summary="Found 0 security issue(s) (no risky sinks)"
+            )
+            return {
+                "findings": [],
+            }
+
+        # Callers can opt out of caching with {"no_cache": True}
+        use_cache = not (context and context.get("no_cache"))
+        cache_key = content_key(
+            code, self.agent_type, context.get("options") if context else None
         )
 
-        # --------------------------------------------------------------
-        # Parse response safely
-        # --------------------------------------------------------------
+        cached = self._findings_cache.get(cache_key) if use_cache else None
 
-        try:
-            findings: List[Dict[str, Any]] = self._extract_json_array(raw_response)
+        if cached is not None:
+            await self._emit_thinking("Reusing cached findings for this code")
+            findings = [dict(f) for f in cached]
+            await self._publish_findings(findings, shared_context)
+            await self._emit_agent_completed(
+                summary=f"Found {len(findings)} security issue(s) (cached)"
+            )
+            return {
+                "findings": findings,
+            }
 
-        except Exception as e:
-            await self._emit_error(
-                f"Failed to parse LLM JSON response: {e}. "
-                f"Raw response: {raw_response[:300]}",
-                recoverable=False,
+        await self._emit_thinking("Scanning code for security-sensitive patterns")
+
+        findings: List[Dict[str, Any]] = []
+        seen = set()
+
+        async def on_finding(finding: Dict[str, Any]) -> None:
+            # Chunks can report the same issue; publish it once
+            key = (
+                finding.get("category"),
+                finding.get("line"),
+                str(finding.get("description", ""))[:64],
             )
-            findings = []
 
-        # --------------------------------------------------------------
-        # Post-process findings
-        # --------------------------------------------------------------
+            if key in seen:
+                return
 
-        for finding in findings:
+            seen.add(key)
 
             # Attach agent metadata
             finding["agent_id"] = self.agent_id
             finding["agent_type"] = self.agent_type
 
-            await self._emit_finding(finding)
+            findings.append(finding)
+            await self._publish_findings([finding], shared_context)
 
-            if shared_context:
-                shared_context.add_finding(finding)
+        # Findings are published as they stream in
+        chunks = self._split_code(code, code_ctx)
+
+        if len(chunks) == 1:
+            errors = [await self._analyze_chunk(0, code, on_finding)]
+        else:
+            await self._emit_thinking(f"Analyzing {len(chunks)} chunks in parallel")
+            errors = await asyncio.gather(*(
+                self._analyze_chunk(offset, segment, on_finding)
+                for offset, segment in chunks
+            ))
+
+        parsed = True
+
+        for error in errors:
+            if error:
+                await self._emit_error(error, recoverable=False)
+                parsed = False
+
+        # Only cache successfully parsed responses
+        if parsed and use_cache:
+            self._findings_cache.set(cache_key, [dict(f) for f in findings])
 
         await self._emit_agent_completed(
             summary=f"Found {len(findings)} security issue(s)"
@@ -210,3 +607,16 @@ CODE:
         return {
             "findings": findings,
         }
+
+    async def _publish_findings(
+        self,
+        findings: List[Dict[str, Any]],
+        shared_context: Optional[SharedContext],
+    ) -> None:
+        """Emit findings and store them in SharedContext."""
+        for finding in findings:
+
+            await self._emit_finding(finding)
+
+            if shared_context:
+                shared_context.add_finding(finding)
@@ -0,0 +1,80 @@
+"""
+Background analysis tasks.
+
+Long reviews can be started without blocking the caller: the work runs
+as an asyncio task on the current loop and callers poll its status by
+task id.
+"""
+
+import asyncio
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, Optional
+
+
+class TaskQueue:
+    """
+    Registry of background analysis tasks for one process.
+
+    Finished tasks are kept (most recent ``max_finished``) so their
+    results can still be fetched.
+    """
+
+    def __init__(self, max_finished: int = 256):
+        self._max_finished = max_finished
+        self._tasks: "OrderedDict[str, asyncio.Task]" = OrderedDict()
+
+    def submit(self, work: Awaitable[Dict[str, Any]]) -> str:
+        """
+        Start ``work`` in the background.
+
+        Returns:
+            The task id
+        """
+        task_id = str(uuid.uuid4())
+        self._tasks[task_id] = asyncio.ensure_future(work)
+        self._evict()
+        return task_id
+
+    def status(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of a task.
+
+        Returns:
+            {"task_id", "status": "running|completed|failed|cancelled"}
+            plus "result" or "error" once finished, or None for unknown ids
+        """
+        task = self._tasks.get(task_id)
+
+        if task is None:
+            return None
+
+        state: Dict[str, Any] = {"task_id": task_id}
+
+        if not task.done():
+            state["status"] = "running"
+        elif task.cancelled():
+            state["status"] = "cancelled"
+        elif task.exception() is not None:
+            state["status"] = "failed"
+            state["error"] = str(task.exception())
+        else:
+            state["status"] = "completed"
+            state["result"] = task.result()
+
+        return state
+
+    async def wait(self, task_id: str) -> Dict[str, Any]:
+        """Wait for a task to finish and return its result."""
+        return await asyncio.shield(self._tasks[task_id])
+
+    def cancel(self, task_id: str) -> bool:
+        """Cancel a running task. Returns False if it is unknown or done."""
+        task = self._tasks.get(task_id)
+        return task is not None and task.cancel()
+
+    def _evict(self) -> None:
+        finished = [tid for tid, task in self._tasks.items() if task.done()]
+
+        for task_id in finished[:max(0, len(finished) - self._max_finished)]:
+            del self._tasks[task_id]
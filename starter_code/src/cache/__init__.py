@@ -0,0 +1,9 @@
+"""
+Result caches shared by agents.
+"""
+
+from .keys import content_key
+from .semantic_cache import SemanticCache, fingerprint
+from .ttl_cache import TTLCache
+
+__all__ = ["SemanticCache", "TTLCache", "content_key", "fingerprint"]
@@ -0,0 +1,23 @@
+"""
+Cache key helpers.
+"""
+
+import hashlib
+import json
+from typing import Any, Optional
+
+
+def content_key(code: str, agent_type: str, options: Optional[Any] = None) -> str:
+    """
+    Key for results derived from ``code`` by one agent type.
+
+    Combines a BLAKE2b digest of the exact code with the agent type and
+    a digest of the (JSON-serializable) analysis options, so runs with
+    different options never share an entry.
+    """
+    code_digest = hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+    options_digest = hashlib.blake2b(
+        json.dumps(options or {}, sort_keys=True, default=str).encode("utf-8"),
+        digest_size=8,
+    ).hexdigest()
+    return f"{code_digest}:{agent_type}:{options_digest}"
@@ -0,0 +1,158 @@
+"""
+SemanticCache - persistent cache of agent findings keyed by code fingerprint.
+
+The fingerprint ignores comments, indentation width and trailing
+whitespace but keeps block structure and every token's line number, so
+snippets that differ only in formatting share an entry and cached
+findings still point at the right lines. Entries are namespaced (e.g.
+per agent type and prompt version) and expire after a TTL.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import textwrap
+import threading
+import time
+import tokenize
+from typing import Any, Dict, List, Optional
+
+
+# Tokens that carry no meaning for analysis
+_IGNORED_TOKENS = {
+    tokenize.COMMENT,
+    tokenize.NL,
+    tokenize.ENCODING,
+}
+
+# Kept by type only: block structure matters, indentation width does not
+_BLOCK_TOKENS = {tokenize.INDENT, tokenize.DEDENT}
+
+
+def fingerprint(code: str) -> str:
+    """
+    Compute a formatting-insensitive fingerprint of Python code.
+
+    Falls back to whitespace-normalized text if the code cannot be
+    tokenized.
+    """
+    try:
+        tokens = tokenize.generate_tokens(io.StringIO(textwrap.dedent(code)).readline)
+        normalized = "\n".join(
+            f"{tok.start[0]}:"
+            + (tokenize.tok_name[tok.type] if tok.type in _BLOCK_TOKENS else tok.string)
+            for tok in tokens
+            if tok.type not in _IGNORED_TOKENS
+        )
+
+    except (tokenize.TokenError, IndentationError, SyntaxError):
+        normalized = "\n".join(
+            line.rstrip() for line in textwrap.dedent(code).split("\n")
+        )
+
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# Open database files, shared by every cache on the same path
+_connections: Dict[str, sqlite3.Connection] = {}
+_connections_lock = threading.Lock()
+
+
+def _open(path: str) -> sqlite3.Connection:
+    if path != ":memory:":
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    conn = sqlite3.connect(path, check_same_thread=False)
+
+    if path != ":memory:":
+        # WAL lets readers run alongside a writer, and with synchronous=NORMAL
+        # commits no longer fsync; a crash can only lose recent cache entries
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS findings_cache (
+            namespace TEXT NOT NULL,
+            fingerprint TEXT NOT NULL,
+            findings TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (namespace, fingerprint)
+        )
+        """
+    )
+    conn.commit()
+    return conn
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    """
+    Return the connection for ``path``, opening it on first use.
+
+    ":memory:" always gets a new, private database.
+    """
+    if path == ":memory:":
+        return _open(path)
+
+    path = os.path.abspath(path)
+
+    with _connections_lock:
+        conn = _connections.get(path)
+
+        if conn is None:
+            conn = _connections[path] = _open(path)
+
+    return conn
+
+
+class SemanticCache:
+    """
+    SQLite-backed findings cache.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 24 * 3600):
+        """
+        Args:
+            path: SQLite database path (":memory:" for a private cache)
+            ttl_seconds: How long entries stay valid
+        """
+        self._ttl = ttl_seconds
+        self._conn = _connect(path)
+
+    def get(self, namespace: str, code: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return cached findings for ``code``, or None on miss/expiry.
+        """
+        row = self._conn.execute(
+            "SELECT findings, created_at FROM findings_cache "
+            "WHERE namespace = ? AND fingerprint = ?",
+            (namespace, fingerprint(code)),
+        ).fetchone()
+
+        if row is None:
+            return None
+
+        findings, created_at = row
+
+        if time.time() - created_at > self._ttl:
+            return None
+
+        return json.loads(findings)
+
+    def put(
+        self,
+        namespace: str,
+        code: str,
+        findings: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Store findings for ``code``.
+        """
+        self._conn.execute(
+            "INSERT OR REPLACE INTO findings_cache "
+            "(namespace, fingerprint, findings, created_at) VALUES (?, ?, ?, ?)",
+            (namespace, fingerprint(code), json.dumps(findings), time.time()),
+        )
+        self._conn.commit()
@@ -32,11 +32,34 @@ class SystemConfig:
     # Streaming settings
     stream_buffer_size: int = 100
     event_queue_maxsize: int = 1000
+    thinking_flush_interval_seconds: float = 0.05  # Batch window for streamed thinking
+    sse_send_buffer_bytes: int = 4 << 20  # SO_SNDBUF for SSE clients; 0 keeps the OS default
+    sse_notsent_lowat_bytes: int = 128 << 10  # Unsent bytes queued in the kernel per SSE client
+    sse_batch_window_ms: float = 10  # How long an SSE write waits for more events
+    sse_batch_max_events: int = 256  # Max events per SSE write
 
     # Analysis settings
     max_file_size_bytes: int = 100_000  # 100KB
+    security_chunk_chars: int = 20_000  # Larger code is analyzed in parallel chunks
     supported_extensions: tuple = (".py",)
 
+    # Execution settings
+    step_timeout_seconds: float = 60.0  # Used when a plan step has no timeout
+    max_concurrent_llm_calls: int = 8  # Plan steps running at once per coordinator
+    llm_batch_max_size: int = 8  # Max snippets coalesced into one bug analysis request
+    llm_batch_wait_ms: float = 50  # How long to wait for more snippets to batch
+    plan_hedge_count: int = 2  # Fallback (non-streamed) planner requests; first valid plan wins
+    fuse_parallel_steps: bool = True  # One LLM request for parallel roots of cached/fallback plans
+    llm_fusion_wait_ms: float = 100  # How long fused steps wait for each other's LLM calls
+    code_executor_workers: int = 2  # Pre-started interpreters kept ready for execute_code
+
+    # Findings cache
+    findings_cache_path: str = field(default_factory=lambda: os.getenv(
+        "FINDINGS_CACHE_PATH",
+        os.path.join(os.path.expanduser("~"), ".cache", "ai_code_review", "findings.sqlite3"),
+    ))
+    findings_cache_ttl_seconds: int = 24 * 3600
+
     def validate(self) -> bool:
         """Validate the configuration."""
         if not self.anthropic_api_key:
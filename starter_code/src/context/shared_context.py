@@ -3,7 +3,7 @@ SharedContext - Global working memory for agents.
 Includes result consolidation and severity ranking.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from collections import defaultdict
 
 
@@ -58,108 +58,59 @@ class SharedContext:
             self._report = self._empty_report()
             return self._report
 
-        merged = self._deduplicate(self._findings)
-        ranked = self._rank_severity(merged)
-        summary = self._build_summary(ranked)
-
-        self._report = {
-            "total_findings": len(ranked),
-            "risk_score": summary["risk_score"],
-            "severity_breakdown": summary["severity_breakdown"],
-            "agent_breakdown": summary["agent_breakdown"],
-            "findings": ranked,
-        }
-
-        return self._report
+        # One pass does deduplication, scoring and counting
+        unique: Dict[Tuple[Any, Any, Any], Dict[str, Any]] = {}
+        scores: List[int] = []
+        severity_count: Dict[str, int] = defaultdict(int)
+        agent_count: Dict[str, int] = defaultdict(int)
+        risk_score = 0
 
-    # ---------------------------------------------------------
-    # Deduplication
-    # ---------------------------------------------------------
+        for f in self._findings:
+            key = self._dedup_key(f)
 
-    def _deduplicate(
-        self,
-        findings: List[Dict[str, Any]],
-    ) -> List[Dict[str, Any]]:
-        """
-        Remove duplicate findings.
-        """
+            if key in unique:
+                continue
 
-        seen = set()
-        unique = []
+            unique[key] = f
 
-        for f in findings:
+            weight = self._severity_weight(f)
 
-            # Dedup key
-            key = (
-                f.get("category"),
-                f.get("line"),
-                f.get("description"),
-            )
+            scores.append(weight)
+            severity_count[f.get("severity", "low")] += 1
+            agent_count[f.get("agent_type", "unknown")] += 1
+            risk_score += weight
 
-            if key in seen:
-                continue
+        merged = list(unique.values())
+        order = sorted(range(len(merged)), key=scores.__getitem__, reverse=True)
+        ranked = [merged[i] for i in order]
 
-            seen.add(key)
-            unique.append(f)
+        self._report = {
+            "total_findings": len(ranked),
+            "risk_score": risk_score,
+            "severity_breakdown": dict(severity_count),
+            "agent_breakdown": dict(agent_count),
+            "findings": ranked,
+        }
 
-        return unique
+        return self._report
 
     # ---------------------------------------------------------
-    # Severity Ranking
+    # Deduplication & Ranking
     # ---------------------------------------------------------
 
-    def _rank_severity(
-        self,
-        findings: List[Dict[str, Any]],
-    ) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _dedup_key(finding: Dict[str, Any]) -> Tuple[Any, Any, Any]:
         """
-        Sort findings by severity.
+        Key under which duplicate findings collapse (first one wins).
         """
+        get = finding.get
+        return (get("category"), get("line"), get("description"))
 
-        def score(f):
-            return self.SEVERITY_WEIGHTS.get(
-                f.get("severity", "low"),
-                1,
-            )
-
-        return sorted(
-            findings,
-            key=score,
-            reverse=True,
-        )
-
-    # ---------------------------------------------------------
-    # Summary Builder
-    # ---------------------------------------------------------
-
-    def _build_summary(
-        self,
-        findings: List[Dict[str, Any]],
-    ) -> Dict[str, Any]:
+    def _severity_weight(self, finding: Dict[str, Any]) -> int:
         """
-        Build global statistics.
+        Ranking and risk weight of a finding.
         """
-
-        severity_count = defaultdict(int)
-        agent_count = defaultdict(int)
-
-        risk_score = 0
-
-        for f in findings:
-
-            sev = f.get("severity", "low")
-            agent = f.get("agent_type", "unknown")
-
-            severity_count[sev] += 1
-            agent_count[agent] += 1
-
-            risk_score += self.SEVERITY_WEIGHTS.get(sev, 1)
-
-        return {
-            "risk_score": risk_score,
-            "severity_breakdown": dict(severity_count),
-            "agent_breakdown": dict(agent_count),
-        }
+        return self.SEVERITY_WEIGHTS.get(finding.get("severity", "low"), 1)
 
     # ---------------------------------------------------------
     # Empty Report
@@ -1,25 +1,214 @@
 import asyncio
-from typing import List
+import inspect
+import itertools
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from ..config import config
+from .event_types import Event, EventType
+
+
+EventCallback = Callable[[Event], object]
+
+
+class _Subscription:
+    """A queue or callback subscriber, optionally filtered by event type."""
+
+    __slots__ = ("queue", "callback", "event_type")
+
+    def __init__(
+        self,
+        queue: Optional[asyncio.Queue],
+        callback: Optional[EventCallback],
+        event_type: Optional[EventType],
+    ):
+        self.queue = queue
+        self.callback = callback
+        self.event_type = event_type
 
 
 class EventBus:
     """
     Async pub/sub event bus using asyncio queues.
+
+    Subscriber queues are bounded. Publishing never waits on a slow
+    consumer: when a subscriber's queue is full its oldest event is
+    dropped to make room, so consumers that fall behind still see the
+    latest events. Drops are counted per subscriber; new drops are
+    reported periodically as an events_dropped event.
+
+    Subscriptions are indexed by event type, so publishing only visits
+    the subscribers of that type and the catch-all subscribers. The
+    index also lets publishers skip building events nobody listens to
+    (see has_subscribers).
     """
 
-    def __init__(self):
-        # Each subscriber gets its own queue
-        self._subscribers: List[asyncio.Queue] = []
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        drop_report_interval: float = 5.0,
+    ):
+        self._maxsize = maxsize if maxsize is not None else config.event_queue_maxsize
+
+        # Subscriptions keyed by subscriber id (in subscription order)
+        self._subscribers: Dict[int, _Subscription] = {}
+        self._ids = itertools.count()
+
+        # (subscriber id, subscription) per event type; None is "all types"
+        self._by_type: Dict[Optional[EventType], List[Tuple[int, _Subscription]]] = {}
+
+        # Loop the subscribers live on, for publish_sync from other threads
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
 
-    def subscribe(self) -> asyncio.Queue:
+        # Dropped event counts, keyed by subscriber id, and the counts
+        # as of the last events_dropped report
+        self._dropped: Dict[int, int] = {}
+        self._reported_drops: Dict[int, int] = {}
+        self._unreported_drops = False
+        self._drop_report_interval = drop_report_interval
+        self._last_drop_report = time.monotonic()
+
+    def subscribe(
+        self,
+        callback: Optional[EventCallback] = None,
+        event_type: Optional[EventType] = None,
+    ) -> Union[asyncio.Queue, EventCallback]:
         """
         Subscribe to the event stream.
-        Returns an asyncio.Queue.
+
+        Args:
+            callback: Called with each event. If omitted, events are
+                delivered to a new bounded queue instead.
+            event_type: Only receive events of this type (default: all)
+
+        Returns:
+            The asyncio.Queue, or the callback; either can be passed to
+            unsubscribe().
         """
-        queue = asyncio.Queue()
-        self._subscribers.append(queue)
-        return queue
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+
+        queue = None if callback else asyncio.Queue(maxsize=self._maxsize)
+
+        sub_id = next(self._ids)
+        sub = _Subscription(queue, callback, event_type)
+
+        self._subscribers[sub_id] = sub
+        self._by_type.setdefault(event_type, []).append((sub_id, sub))
+
+        return queue if queue is not None else callback
+
+    def unsubscribe(self, subscriber: Union[asyncio.Queue, EventCallback]) -> None:
+        """Remove a queue or callback returned by subscribe()."""
+        for sub_id, sub in list(self._subscribers.items()):
+            if sub.queue is subscriber or sub.callback is subscriber:
+                del self._subscribers[sub_id]
+
+                bucket = self._by_type[sub.event_type]
+                bucket.remove((sub_id, sub))
+                if not bucket:
+                    del self._by_type[sub.event_type]
+
+    def has_subscribers(self, event_type: EventType) -> bool:
+        """Whether any subscriber would receive events of ``event_type``."""
+        return None in self._by_type or event_type in self._by_type
 
     async def publish(self, event) -> None:
-        for queue in self._subscribers:
-            await queue.put(event)
+        self._publish_now(event)
+
+    def publish_sync(self, event) -> None:
+        """
+        Publish from synchronous code, possibly on another thread.
+
+        On the subscribers' event loop (or before any loop is known) the
+        event is delivered immediately. From any other thread delivery
+        is handed to the loop via call_soon_threadsafe, so the caller
+        never blocks.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        if self._loop is None or running is self._loop or self._loop.is_closed():
+            self._publish_now(event)
+        else:
+            self._loop.call_soon_threadsafe(self._publish_now, event)
+
+    async def drain(self) -> None:
+        """
+        Wait until every queue subscriber has processed its events.
+
+        Consumers must call ``queue.task_done()`` after handling each
+        event, otherwise this never returns.
+        """
+        await asyncio.gather(
+            *(sub.queue.join() for sub in self._subscribers.values() if sub.queue is not None)
+        )
+
+    def dropped_events(self) -> Dict[int, int]:
+        """Return dropped event counts per subscriber id."""
+        return dict(self._dropped)
+
+    # ---------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------
+
+    def _publish_now(self, event) -> None:
+        self._deliver(event)
+
+        if self._unreported_drops:
+            self._maybe_report_drops()
+
+    def _deliver(self, event) -> None:
+        by_type = self._by_type
+        targets = by_type.get(event.event_type, ())
+
+        if None in by_type:
+            targets = [*targets, *by_type[None]]
+
+        for sub_id, sub in targets:
+            if sub.callback is not None:
+                result = sub.callback(event)
+                if inspect.isawaitable(result):
+                    asyncio.ensure_future(result)
+                continue
+
+            queue = sub.queue
+
+            # Ring-buffer semantics: a full queue sheds its oldest event
+            if queue.full():
+                queue.get_nowait()
+                queue.task_done()
+                self._dropped[sub_id] = self._dropped.get(sub_id, 0) + 1
+                self._unreported_drops = True
+
+            queue.put_nowait(event)
+
+    def _maybe_report_drops(self) -> None:
+        now = time.monotonic()
+
+        if now - self._last_drop_report < self._drop_report_interval:
+            return
+
+        self._last_drop_report = now
+
+        # Only what was dropped since the previous report
+        reported = self._reported_drops
+        dropped = {
+            sub_id: count - reported.get(sub_id, 0)
+            for sub_id, count in self._dropped.items()
+            if count > reported.get(sub_id, 0)
+        }
+        self._reported_drops = dict(self._dropped)
+        self._unreported_drops = False
+
+        self._deliver(
+            Event(
+                event_type=EventType.EVENTS_DROPPED,
+                agent_id="event_bus",
+                data={"dropped": dropped},
+            )
+        )
@@ -5,14 +5,68 @@ See STREAMING_EVENTS_SPEC.md for full event schema documentation.
 """
 
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from enum import Enum, auto
 from typing import Any, Dict, Optional
+import itertools
+import json
+import os
+import time
 import uuid
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
 
-class EventType(Enum):
-    """Types of events in the system."""
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Event ids: a random per-process prefix plus a counter. Unique across
+# processes like uuid4, without a urandom call per event.
+_id_prefix = uuid.uuid4().hex[:12]
+_id_counter = itertools.count()
+
+
+def _reset_event_ids() -> None:
+    global _id_prefix, _id_counter
+    _id_prefix = uuid.uuid4().hex[:12]
+    _id_counter = itertools.count()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_event_ids)
+
+
+def new_event_id() -> str:
+    """Return a new process-unique event id."""
+    return f"{_id_prefix}-{next(_id_counter)}"
+
+
+def format_timestamp(timestamp_ns: int) -> str:
+    """Format a nanosecond Unix timestamp as ISO 8601 UTC ("...Z")."""
+    moment = _EPOCH + timedelta(microseconds=timestamp_ns // 1000)
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def parse_timestamp(value: str) -> int:
+    """Parse an ISO 8601 UTC timestamp into Unix nanoseconds."""
+    moment = datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+
+    # Integer field arithmetic; dividing timedeltas is several times slower
+    delta = moment - _EPOCH
+    return ((delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds) * 1000
+
+
+class EventType(str, Enum):
+    """
+    Types of events in the system.
+
+    Members are strings, so they compare and hash equal to their raw
+    values: "thinking" works anywhere EventType.THINKING does.
+    """
 
     # Planning events
     PLAN_CREATED = "plan_created"
@@ -43,21 +97,35 @@ class EventType(Enum):
     FINDINGS_CONSOLIDATED = "findings_consolidated"
     FINAL_REPORT = "final_report"
 
+    # LLM observability events
+    LLM_USAGE = "llm_usage"
+
+    # Event bus diagnostics
+    EVENTS_DROPPED = "events_dropped"
+
 
-@dataclass
+# Raw value -> member; a dict hit instead of a call through EnumMeta
+_EVENT_TYPES: Dict[str, EventType] = {member.value: member for member in EventType}
+
+
+@dataclass(slots=True)
 class Event:
     """
     Base event structure for the system.
 
     All events follow this structure for consistency and
     easy serialization for streaming.
+
+    ``timestamp`` is Unix time in nanoseconds; it is only formatted as
+    ISO 8601 when the event is serialized. Slotted, since streaming
+    agents create many short-lived events.
     """
 
     event_type: EventType
     agent_id: str
     data: Dict[str, Any]
-    timestamp: datetime = field(default_factory=datetime.utcnow)
-    event_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    timestamp: int = field(default_factory=time.time_ns)
+    event_id: str = field(default_factory=new_event_id)
     correlation_id: Optional[str] = None  # For linking related events
 
     def to_dict(self) -> Dict[str, Any]:
@@ -66,19 +134,37 @@ class Event:
             "event_id": self.event_id,
             "event_type": self.event_type.value,
             "agent_id": self.agent_id,
-            "timestamp": self.timestamp.isoformat() + "Z",
+            "timestamp": format_timestamp(self.timestamp),
             "correlation_id": self.correlation_id,
             "data": self.data
         }
 
+    def to_json(self) -> str:
+        """Serialize event to a JSON string."""
+        return self.to_bytes().decode("utf-8")
+
+    def to_bytes(self) -> bytes:
+        """
+        Serialize event to UTF-8 JSON, ready to write to a stream.
+
+        Uses orjson when installed; values it cannot encode fall back
+        to str() and non-str keys are stringified, as with
+        json.dumps(default=str).
+        """
+        if orjson is not None:
+            return orjson.dumps(
+                self.to_dict(), default=str, option=orjson.OPT_NON_STR_KEYS
+            )
+        return json.dumps(self.to_dict(), default=str).encode("utf-8")
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Event":
         """Create event from dictionary."""
         return cls(
-            event_id=data.get("event_id", str(uuid.uuid4())),
-            event_type=EventType(data["event_type"]),
+            event_id=data.get("event_id") or new_event_id(),
+            event_type=_EVENT_TYPES.get(data["event_type"]) or EventType(data["event_type"]),
             agent_id=data["agent_id"],
-            timestamp=datetime.fromisoformat(data["timestamp"].rstrip("Z")),
+            timestamp=parse_timestamp(data["timestamp"]),
             correlation_id=data.get("correlation_id"),
             data=data.get("data", {})
         )
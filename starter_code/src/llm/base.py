@@ -4,8 +4,9 @@ LLM base interface.
 All LLM providers (OpenAI, Claude, etc.) must implement this interface.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 
 class LLMClient(ABC):
@@ -30,3 +31,72 @@ class LLMClient(ABC):
             Generated text
         """
         raise NotImplementedError
+
+    async def generate_with_usage(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        cache_key: Optional[str] = None,
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Generate a completion and report token usage.
+
+        Providers that support prompt caching should route requests
+        sharing ``cache_key`` to the same cache and report cache hits
+        as ``cached_tokens``.
+
+        Default: no usage information.
+
+        Returns:
+            Tuple of (generated text, usage counters)
+        """
+        text = await self.generate(system_prompt, user_prompt, tools)
+        return text, {}
+
+    async def generate_batch(
+        self,
+        prompts: List[Tuple[str, str]],
+        tools: Optional[List[Dict[str, Any]]] = None,
+        cache_key: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Generate completions for several (system_prompt, user_prompt) pairs.
+
+        Default: all requests are issued concurrently, so N prompts cost
+        about one round trip instead of N.
+
+        Returns:
+            Generated texts, in the order of ``prompts``
+
+        Raises:
+            Exception: The first error from any request
+        """
+        results = await asyncio.gather(*(
+            self.generate_with_usage(system_prompt, user_prompt, tools, cache_key)
+            for system_prompt, user_prompt in prompts
+        ))
+        return [text for text, _ in results]
+
+    async def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        cache_key: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a completion as text chunks.
+
+        If ``usage`` is given, it is updated with token counters once the
+        stream is exhausted.
+
+        Default: a single chunk from generate_with_usage().
+        """
+        text, counters = await self.generate_with_usage(
+            system_prompt, user_prompt, tools, cache_key
+        )
+        if usage is not None:
+            usage.update(counters)
+        yield text
@@ -0,0 +1,109 @@
+"""
+Coalesce concurrent calls into batched LLM requests.
+"""
+
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+
+BatchFn = Callable[[Any, List[Any]], Awaitable[List[Any]]]
+
+
+class _Batcher:
+    """Collects items for one owner and flushes them to the batch function."""
+
+    def __init__(self, fn: BatchFn, owner: Any, max_batch_size: int, wait: float):
+        self._fn = fn
+        self._owner = owner
+        self._max_batch_size = max_batch_size
+        self._wait = wait
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, item: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        items = [item for item, _ in batch]
+
+        try:
+            results = await self._fn(self._owner, items)
+
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"Batch function returned {len(results)} results for {len(items)} items"
+                )
+
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            # Callers may have been cancelled (e.g. step timeout)
+            if not future.done():
+                future.set_result(result)
+
+
+class batched:
+    """
+    Method decorator that coalesces concurrent calls into one batch.
+
+    The decorated coroutine method takes a list of items and returns a
+    list of results in the same order. Callers pass a single item and
+    get back its result. Calls arriving within ``wait_ms`` of the first
+    one (up to ``max_batch_size``) share one invocation; each instance
+    batches independently.
+
+    Example:
+        @batched(max_batch_size=8, wait_ms=50)
+        async def _analyze_many(self, codes: List[str]) -> List[Result]:
+            ...
+
+        result = await agent._analyze_many(code)
+    """
+
+    def __init__(self, max_batch_size: int = 8, wait_ms: float = 50):
+        self._max_batch_size = max_batch_size
+        self._wait = wait_ms / 1000
+
+    def __call__(self, fn: BatchFn) -> "batched":
+        self._fn = fn
+        functools.update_wrapper(self, fn)
+        return self
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._attr = f"_{name}_batcher"
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        if instance is None:
+            return self
+
+        batcher = instance.__dict__.get(self._attr)
+
+        if batcher is None:
+            batcher = _Batcher(self._fn, instance, self._max_batch_size, self._wait)
+            instance.__dict__[self._attr] = batcher
+
+        return batcher.submit
@@ -0,0 +1,140 @@
+"""
+Fuse concurrent LLM calls from different agents on the same code into
+one request.
+
+The coordinator creates an LLMFuser for plan steps that start together
+and exposes it through the ``current_fuser`` context variable; agents
+route their LLM calls through it (see BaseAgent._call_llm). Each task's
+prompt goes into one combined request, the code is included once, and
+the JSON object that comes back is split per task.
+"""
+
+import asyncio
+import contextvars
+import json
+from typing import Any, List, Optional, Tuple
+
+from .base import LLMClient
+from .json_extract import loads
+
+
+_SYSTEM_PROMPT = (
+    "You perform several independent code analysis tasks at once.\n"
+    "Each task has its own instructions and output format.\n\n"
+    "Output Rules:\n"
+    "- Return ONLY a JSON object\n"
+    "- Keys are the task numbers as strings (\"0\", \"1\", ...)\n"
+    "- Each value is that task's output, exactly as its instructions require\n"
+    "- No explanations\n"
+    "- No markdown"
+)
+
+_CODE_REF = "(see CODE at the end)"
+
+
+# Fuser for the current plan step, if its LLM calls should be fused
+current_fuser: contextvars.ContextVar[Optional["LLMFuser"]] = contextvars.ContextVar(
+    "current_fuser", default=None
+)
+
+
+class LLMFuser:
+    """
+    One-shot coalescer for the first LLM call of ``expected`` agents.
+
+    Calls are held until all expected agents have called or ``wait_ms``
+    elapsed. A single call, a failed fused request or a task missing
+    from the response resolves to None: the caller then makes its own
+    request. Calls after the fused request went out also get None.
+    """
+
+    def __init__(self, llm: LLMClient, code: str, expected: int, wait_ms: float = 100):
+        self._llm = llm
+        self._code = code
+        self._expected = expected
+        self._wait = wait_ms / 1000
+        self._pending: List[Tuple[str, str, str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._closed = False
+
+    async def call(self, role: str, system_prompt: str, user_prompt: str) -> Optional[str]:
+        """
+        Submit one agent's request.
+
+        Returns:
+            The agent's share of the fused response, or None if the
+            caller should make its own request
+        """
+        if self._closed:
+            return None
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((role, system_prompt, user_prompt, future))
+
+        if len(self._pending) >= self._expected:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._wait, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        self._closed = True
+        pending, self._pending = self._pending, []
+
+        if len(pending) == 1:
+            pending[0][3].set_result(None)
+        elif pending:
+            asyncio.ensure_future(self._run(pending))
+
+    async def _run(self, pending: List[Tuple[str, str, str, asyncio.Future]]) -> None:
+        results: dict = {}
+
+        try:
+            text = await self._llm.generate(
+                system_prompt=_SYSTEM_PROMPT,
+                user_prompt=self._build_prompt(pending),
+            )
+            results = self._parse(text)
+
+        except Exception:
+            # Every caller falls back to its own request
+            pass
+
+        for i, (_, _, _, future) in enumerate(pending):
+            if future.done():
+                continue
+
+            output = results.get(str(i))
+            future.set_result(None if output is None else json.dumps(output))
+
+    def _build_prompt(self, pending: List[Tuple[str, str, str, asyncio.Future]]) -> str:
+        tasks = []
+
+        for i, (role, system_prompt, user_prompt, _) in enumerate(pending):
+            if self._code and self._code in user_prompt:
+                user_prompt = user_prompt.replace(self._code, _CODE_REF)
+
+            tasks.append(
+                f"### TASK {i} ({role})\n\n"
+                f"Instructions:\n{system_prompt}\n\n"
+                f"{user_prompt.strip()}"
+            )
+
+        return "\n\n".join(tasks) + f"\n\n### CODE\n{self._code}\n"
+
+    def _parse(self, text: str) -> dict:
+        text = text.strip()
+        start, end = text.find("{"), text.rfind("}")
+
+        if start == -1 or end < start:
+            return {}
+
+        parsed: Any = loads(text[start:end + 1])
+
+        return parsed if isinstance(parsed, dict) else {}
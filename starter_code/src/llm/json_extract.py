@@ -0,0 +1,211 @@
+"""
+Helpers for pulling JSON out of free-form LLM output.
+"""
+
+import json
+from typing import Any, List, Optional, Tuple, Union
+
+# orjson is considerably faster on LLM-sized payloads; its decode error
+# subclasses ValueError, same as json's
+try:
+    import orjson
+
+    def loads(text: Union[str, bytes]) -> Any:
+        """Parse JSON text or UTF-8 bytes (orjson when installed)."""
+        # orjson reads str and bytes directly; no encode round-trip
+        return orjson.loads(text)
+
+except ImportError:  # pragma: no cover - orjson is optional
+
+    def loads(text: Union[str, bytes]) -> Any:
+        """Parse JSON text or UTF-8 bytes (orjson when installed)."""
+        return json.loads(text)
+
+
+def find_json_array(text: str, start: int = 0) -> Optional[Tuple[int, int]]:
+    """
+    Locate the first balanced JSON array in ``text`` at or after ``start``.
+
+    Single linear scan: tracks bracket depth and skips brackets inside
+    JSON strings (honouring backslash escapes). No backtracking, so
+    responses with several arrays or prose around the JSON stay O(n).
+
+    Args:
+        text: LLM output
+        start: Offset to start searching from
+
+    Returns:
+        (start, end) slice bounds of the array, or None if no balanced
+        array exists
+    """
+    begin = text.find("[", start)
+
+    if begin == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for i in range(begin, len(text)):
+        ch = text[i]
+
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+            continue
+
+        if ch == '"':
+            in_string = True
+        elif ch == "[":
+            depth += 1
+        elif ch == "]":
+            depth -= 1
+            if depth == 0:
+                return begin, i + 1
+
+    return None
+
+
+def extract_json_array(text: str) -> List[Any]:
+    """
+    Extract the first JSON array from LLM output.
+
+    Tries the whole (stripped) text first, then each balanced array in
+    turn, so stray brackets in leading prose are skipped.
+
+    Raises:
+        ValueError: If no JSON array can be parsed
+    """
+    text = text.strip()
+
+    # Fast path: the response is exactly a JSON array
+    if text.startswith("["):
+        try:
+            parsed = loads(text)
+            if isinstance(parsed, list):
+                return parsed
+        except ValueError:
+            pass
+
+    offset = 0
+
+    while True:
+        span = find_json_array(text, offset)
+
+        if span is None:
+            raise ValueError("No JSON array found in response")
+
+        begin, end = span
+
+        try:
+            parsed = loads(text[begin:end])
+            if isinstance(parsed, list):
+                return parsed
+        except ValueError:
+            pass
+
+        offset = begin + 1
+
+
+class JsonArrayStream:
+    """
+    Incremental parser for the elements of a JSON array in streamed text.
+
+    Feed LLM output chunk by chunk; every object/array element of the
+    target array is returned as soon as it closes. Scalar elements are
+    skipped. The target array is the first array in the text, or with
+    ``key`` the first array that is the value of that object key
+    (e.g. ``key="steps"`` for ``{"steps": [...]}``). Elements that fail
+    to parse are skipped, so a malformed tail never loses earlier ones.
+    """
+
+    def __init__(self, key: Optional[str] = None):
+        self._key = key
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._after_key = False
+        self._array_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._done = False
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far."""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk and return the elements completed by it."""
+        self._text += chunk
+        text = self._text
+        items: List[Any] = []
+
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._after_key = (
+                        self._key is not None
+                        and text[self._string_start:i] == self._key
+                    )
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i + 1
+
+            elif ch == "[" or ch == "{":
+                if (
+                    ch == "["
+                    and self._array_depth is None
+                    and not self._done
+                    and (self._key is None or self._after_key)
+                ):
+                    self._depth += 1
+                    self._array_depth = self._depth
+                    continue
+
+                if self._depth == self._array_depth and self._item_start is None:
+                    self._item_start = i
+
+                self._depth += 1
+                self._after_key = False
+
+            elif ch == "]" or ch == "}":
+                self._depth -= 1
+                self._after_key = False
+
+                if self._array_depth is None:
+                    continue
+
+                if self._depth < self._array_depth:
+                    # Target array closed
+                    self._array_depth = None
+                    self._done = True
+
+                elif self._depth == self._array_depth and self._item_start is not None:
+                    try:
+                        items.append(loads(text[self._item_start:i + 1]))
+                    except ValueError:
+                        pass
+                    self._item_start = None
+
+            elif ch != ":" and not ch.isspace():
+                self._after_key = False
+
+        self._pos = len(text)
+        return items
@@ -2,26 +2,73 @@
 OpenAI LLM client implementation.
 """
 
+import importlib.util
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 
 from .base import LLMClient
 
 
-class OpenAIClient(LLMClient):
-    """OpenAI implementation of the LLMClient interface."""
+# HTTP/2 needs the optional "h2" package (pip install httpx[http2])
+_HTTP2 = importlib.util.find_spec("h2") is not None
 
-    def __init__(self, model: str = "gpt-4.1-mini"):
+# Process-wide SDK client. Sharing it means every agent reuses one
+# connection pool (keep-alive connections, TLS sessions).
+_async_client: Optional[AsyncOpenAI] = None
+
+# Process-wide OpenAIClient handed out by OpenAIClient.shared()
+_shared_client: Optional["OpenAIClient"] = None
+
+
+def _get_async_client() -> AsyncOpenAI:
+    """
+    Return the shared AsyncOpenAI client, creating it on first use.
+    """
+    global _async_client
+
+    if _async_client is None:
         api_key = os.getenv("OPENAI_API_KEY")
 
         if not api_key:
             raise RuntimeError("OPENAI_API_KEY not found in environment")
 
-        self._client = OpenAI(api_key=api_key)
+        _async_client = AsyncOpenAI(
+            api_key=api_key,
+            max_retries=2,
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            http_client=DefaultAsyncHttpxClient(
+                http2=_HTTP2,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+            ),
+        )
+
+    return _async_client
+
+
+class OpenAIClient(LLMClient):
+    """OpenAI implementation of the LLMClient interface."""
+
+    def __init__(self, model: str = "gpt-4.1-mini"):
+        self._client = _get_async_client()
         self._model = model
 
+    @classmethod
+    def shared(cls) -> "OpenAIClient":
+        """
+        Return the process-wide client, creating it on first use.
+
+        All agents share it, and with it one HTTP connection pool.
+        """
+        global _shared_client
+
+        if _shared_client is None:
+            _shared_client = cls()
+
+        return _shared_client
+
     async def generate(
         self,
         system_prompt: str,
@@ -34,26 +81,108 @@ class OpenAIClient(LLMClient):
         Always returns text or raises an error.
         Never returns empty string silently.
         """
+        text, _ = await self.generate_with_usage(
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            tools=tools,
+        )
+        return text
+
+    async def generate_with_usage(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        cache_key: Optional[str] = None,
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        Generate a completion and report token usage.
+        """
+        request = self._build_request(system_prompt, user_prompt, tools, cache_key)
 
         try:
-            response = self._client.responses.create(
-                model=self._model,
-                input=[
-                    {
-                        "role": "system",
-                        "content": system_prompt,
-                    },
-                    {
-                        "role": "user",
-                        "content": user_prompt,
-                    },
-                ],
-                tools=tools,
-            )
+            response = await self._client.responses.create(**request)
 
         except Exception as e:
             raise RuntimeError(f"OpenAI API request failed: {e}") from e
 
+        return self._extract_text(response), self._extract_usage(response)
+
+    async def stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        cache_key: Optional[str] = None,
+        usage: Optional[Dict[str, int]] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream output text deltas using the Responses streaming API.
+
+        Iteration waits on the server-sent event stream itself, so no
+        polling is involved.
+        """
+        request = self._build_request(system_prompt, user_prompt, tools, cache_key)
+
+        try:
+            async with self._client.responses.stream(**request) as stream:
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        yield event.delta
+
+                response = await stream.get_final_response()
+
+        except Exception as e:
+            raise RuntimeError(f"OpenAI API request failed: {e}") from e
+
+        if usage is not None:
+            usage.update(self._extract_usage(response))
+
+    # --------------------------------------------------
+    # Request helpers
+    # --------------------------------------------------
+
+    def _build_request(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        tools: Optional[List[Dict[str, Any]]],
+        cache_key: Optional[str],
+    ) -> Dict[str, Any]:
+        """
+        Build Responses API arguments.
+
+        OpenAI caches prompt prefixes automatically; ``cache_key`` is sent
+        as ``prompt_cache_key`` so requests sharing a static prefix
+        (system prompt + tools) land on the same cache shard.
+        """
+        request: Dict[str, Any] = {
+            "model": self._model,
+            "input": [
+                {
+                    "role": "system",
+                    "content": system_prompt,
+                },
+                {
+                    "role": "user",
+                    "content": user_prompt,
+                },
+            ],
+        }
+        if tools:
+            request["tools"] = tools
+        if cache_key:
+            request["prompt_cache_key"] = cache_key
+
+        return request
+
+    # --------------------------------------------------
+    # Response helpers
+    # --------------------------------------------------
+
+    def _extract_text(self, response: Any) -> str:
+        """Extract output text from a Responses API response."""
+
         # --------------------------------------------------
         # Preferred: SDK helper
         # --------------------------------------------------
@@ -92,3 +221,19 @@ class OpenAIClient(LLMClient):
             "OpenAI returned no usable text output. "
             f"Raw response: {response}"
         )
+
+    def _extract_usage(self, response: Any) -> Dict[str, int]:
+        """Extract token counters, including prompt cache hits."""
+
+        usage = getattr(response, "usage", None)
+
+        if usage is None:
+            return {}
+
+        details = getattr(usage, "input_tokens_details", None)
+
+        return {
+            "input_tokens": getattr(usage, "input_tokens", 0) or 0,
+            "cached_tokens": getattr(details, "cached_tokens", 0) or 0,
+            "output_tokens": getattr(usage, "output_tokens", 0) or 0,
+        }
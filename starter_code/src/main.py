@@ -9,11 +9,13 @@ Usage:
 import argparse
 import asyncio
 import sys
+from collections import Counter
 from pathlib import Path
 
 from .config import config
+from .runtime import run
 from .events import EventBus
-from .agents import CoordinatorAgent, SecurityAgent, BugDetectionAgent
+from .agents import CoordinatorAgent, SecurityAgent, BugAgent
 from .ui.streaming_server import ConsoleStreamingUI
 
 
@@ -39,19 +41,22 @@ async def analyze_file(file_path: str, use_streaming_ui: bool = True) -> dict:
     if path.suffix not in config.supported_extensions:
         raise ValueError(f"Unsupported file type: {path.suffix}")
 
-    code = path.read_text()
+    # One read and one UTF-8 decode; every agent shares the resulting string
+    code = path.read_bytes().decode("utf-8")
 
     # Initialize event bus
     event_bus = EventBus()
 
     # Set up streaming UI if requested
+    ui = None
     if use_streaming_ui:
         ui = ConsoleStreamingUI(event_bus)
+        ui.start()
 
     # Initialize agents
     coordinator = CoordinatorAgent(event_bus)
     security_agent = SecurityAgent(event_bus)
-    bug_agent = BugDetectionAgent(event_bus)
+    bug_agent = BugAgent(event_bus)
 
     # Register specialists with coordinator
     coordinator.register_specialist("security", security_agent)
@@ -63,6 +68,9 @@ async def analyze_file(file_path: str, use_streaming_ui: bool = True) -> dict:
 
     results = await coordinator.analyze(code, context={"filename": file_path})
 
+    if ui is not None:
+        await ui.stop()
+
     print("\n" + "=" * 50)
     print("Analysis Complete!")
 
@@ -126,19 +134,16 @@ def main():
     args = parser.parse_args()
 
     if args.server:
-        asyncio.run(run_server(args.host, args.port))
+        run(run_server(args.host, args.port))
     elif args.file:
-        results = asyncio.run(analyze_file(args.file, not args.no_ui))
+        results = run(analyze_file(args.file, not args.no_ui))
 
         # Print summary
         print("\n--- Summary ---")
         findings = results.get("findings", [])
         print(f"Total findings: {len(findings)}")
 
-        by_severity = {}
-        for f in findings:
-            sev = f.get("severity", "unknown")
-            by_severity[sev] = by_severity.get(sev, 0) + 1
+        by_severity = Counter(f.get("severity", "unknown") for f in findings)
 
         for sev, count in sorted(by_severity.items()):
             print(f"  {sev}: {count}")
@@ -8,7 +8,7 @@ Stage 1 behavior:
 """
 
 from typing import Any, Dict, List
-from uuid import uuid4
+import os
 
 from .plan import create_plan
 
@@ -16,6 +16,11 @@ from .plan import create_plan
 class PlanBuilder:
     """Builds an execution plan for a code review run."""
 
+    @staticmethod
+    def _generate_plan_id() -> str:
+        """Random 96-bit hex id; plan ids only need to be unique, not UUIDs."""
+        return os.urandom(12).hex()
+
     def build(self, code: str) -> Dict[str, Any]:
         """
         Build the execution plan for the given code.
@@ -31,7 +36,7 @@ class PlanBuilder:
         Returns:
             Execution plan dictionary
         """
-        plan_id = str(uuid4())
+        plan_id = self._generate_plan_id()
 
         steps: List[Dict[str, Any]] = [
             {
@@ -0,0 +1,149 @@
+"""
+Dependency-aware scheduler for plan steps.
+
+Steps can be added while the plan is still being generated: each step
+starts as soon as all of its dependencies have completed, Kahn-style.
+Finishing a step only touches the steps that depend on it, so total
+scheduling work is O(V + E). Steps run in an asyncio.TaskGroup, which
+cancels the remaining steps when one fails.
+"""
+
+import asyncio
+from collections import defaultdict, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Set
+
+
+Step = Dict[str, Any]
+
+
+class StepScheduler:
+    """
+    Runs plan steps in dependency order as they are added.
+
+    Usage:
+        scheduler = StepScheduler(run_step)
+        runner = asyncio.create_task(scheduler.run())
+        scheduler.add(step)   # any number of times, in any order
+        scheduler.close()     # no more steps
+        await runner
+    """
+
+    def __init__(self, run_step: Callable[[Step], Awaitable[Any]]):
+        self._run_step = run_step
+
+        self._steps: Dict[str, Step] = {}
+        self._completed: Set[str] = set()
+
+        # step_id -> steps waiting on it, and outstanding dependency counts
+        self._dependents: Dict[str, List[str]] = defaultdict(list)
+        self._remaining: Dict[str, int] = {}
+
+        # Steps whose dependencies are done, waiting for run() to start them
+        self._ready: Deque[Step] = deque()
+        self._running = 0
+
+        self._closed = False
+        self._wakeup = asyncio.Event()
+
+    @property
+    def steps(self) -> List[Step]:
+        """Steps added so far, in order of arrival."""
+        return list(self._steps.values())
+
+    @property
+    def started(self) -> bool:
+        """Whether any step has been started."""
+        return bool(self._running or self._completed)
+
+    def add(self, step: Step) -> None:
+        """
+        Add a step; it starts immediately if its dependencies are done.
+
+        Steps whose id was already added are ignored.
+        """
+        step_id = step["step_id"]
+
+        if self._closed:
+            raise RuntimeError("Cannot add steps to a closed scheduler")
+
+        if step_id in self._steps:
+            return
+
+        self._steps[step_id] = step
+
+        deps = set(step.get("depends_on", [])) - self._completed
+        self._remaining[step_id] = len(deps)
+
+        for dep in deps:
+            self._dependents[dep].append(step_id)
+
+        if not deps:
+            self._start(step)
+
+    def close(self) -> None:
+        """
+        Signal that no more steps will be added.
+
+        Raises:
+            RuntimeError: If a step depends on a step that was never added
+        """
+        self._closed = True
+        self._wakeup.set()
+
+        for step_id, step in self._steps.items():
+            unknown = set(step.get("depends_on", [])) - self._steps.keys()
+
+            if unknown:
+                raise RuntimeError(
+                    f"Step {step_id} depends on unknown step(s): {sorted(unknown)}"
+                )
+
+    async def run(self) -> None:
+        """
+        Wait until every step has completed.
+
+        Raises:
+            RuntimeError: If remaining steps can never become ready
+            Exception: The first error raised by a step
+        """
+        try:
+            async with asyncio.TaskGroup() as group:
+                while not (self._closed and len(self._completed) == len(self._steps)):
+
+                    while self._ready:
+                        self._running += 1
+                        group.create_task(self._run_one(self._ready.popleft()))
+
+                    if not self._running and self._closed:
+                        raise RuntimeError("Deadlock detected in plan execution")
+
+                    # Woken by new ready steps, completions and close()
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+
+        except BaseExceptionGroup as group_error:
+            # Callers expect the step's own exception
+            raise group_error.exceptions[0] from None
+
+    # ---------------------------------------------------------
+    # Internals
+    # ---------------------------------------------------------
+
+    def _start(self, step: Step) -> None:
+        self._ready.append(step)
+        self._wakeup.set()
+
+    async def _run_one(self, step: Step) -> None:
+        await self._run_step(step)
+        self._running -= 1
+        self._complete(step["step_id"])
+        self._wakeup.set()
+
+    def _complete(self, step_id: str) -> None:
+        self._completed.add(step_id)
+
+        for dependent in self._dependents.pop(step_id, []):
+            self._remaining[dependent] -= 1
+
+            if self._remaining[dependent] == 0:
+                self._start(self._steps[dependent])
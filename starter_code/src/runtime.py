@@ -0,0 +1,26 @@
+"""
+Event loop setup shared by the CLI entry points.
+"""
+
+import asyncio
+from typing import Any, Coroutine, TypeVar
+
+T = TypeVar("T")
+
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - uvloop is optional (and not on Windows)
+    uvloop = None
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """
+    Run ``main`` to completion, on uvloop when it is installed.
+
+    Falls back to the default asyncio event loop otherwise.
+    """
+    if uvloop is None:
+        return asyncio.run(main)
+
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        return runner.run(main)
@@ -2,6 +2,6 @@
 Tool implementations for agents.
 """
 
-from .code_tools import read_file, execute_code
+from .code_tools import CodeContext, read_file, execute_code
 
-__all__ = ["read_file", "execute_code"]
+__all__ = ["CodeContext", "read_file", "execute_code"]
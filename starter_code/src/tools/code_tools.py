@@ -5,10 +5,83 @@ These tools are available for agents to use during analysis.
 """
 
 import ast
-import os
-from typing import Any, Dict, Optional
+import atexit
+import bisect
+import copy
+import functools
+import hashlib
+import itertools
+import re
+from typing import Any, Dict, List, Optional, Tuple
 import subprocess
-import tempfile
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+from ..cache import TTLCache
+from ..config import config
+
+
+# parse_python_ast results keyed by content digest
+_ast_cache = TTLCache(maxsize=256, ttl=3600)
+
+
+@functools.lru_cache(maxsize=64)
+def _line_index(code: str) -> Tuple[Tuple[str, ...], Tuple[int, ...]]:
+    """
+    Split code into lines once per source.
+
+    Returns:
+        (lines, start offset of each line)
+    """
+    lines = tuple(code.split('\n'))
+    starts = tuple(itertools.accumulate((len(line) + 1 for line in lines[:-1]), initial=0))
+    return lines, starts
+
+
+# Compiled patterns; larger than re's own cache, which agents sweeping
+# many patterns would otherwise keep evicting
+_compile = functools.lru_cache(maxsize=1024)(re.compile)
+
+# Nodes whose list fields can hold statements; expressions never do
+_STMT_NODES = (ast.mod, ast.stmt, ast.excepthandler, ast.match_case)
+
+
+def _digest(code: str) -> bytes:
+    return hashlib.blake2b(code.encode("utf-8"), digest_size=16).digest()
+
+
+@dataclass(frozen=True)
+class CodeContext:
+    """
+    Derived forms of one source, computed once per review.
+
+    The coordinator builds it and passes it to specialists as
+    ``context["code_ctx"]``. The tree is shared: treat it as read-only.
+    """
+    code: str
+    digest: bytes
+    lines: Tuple[str, ...]
+    line_starts: Tuple[int, ...]
+    tree: Optional[ast.Module]  # None if the code does not parse
+
+    @classmethod
+    def build(cls, code: str) -> "CodeContext":
+        """Hash, split and parse ``code``."""
+        lines, line_starts = _line_index(code)
+
+        try:
+            tree = ast.parse(code)
+        except (SyntaxError, ValueError):
+            tree = None
+
+        return cls(code, _digest(code), lines, line_starts, tree)
+
+    @classmethod
+    def of(cls, code: str, context: Optional[Dict[str, Any]]) -> Optional["CodeContext"]:
+        """The CodeContext in ``context`` if it describes ``code``."""
+        code_ctx = context.get("code_ctx") if context else None
+        return code_ctx if code_ctx is not None and code_ctx.code == code else None
 
 
 def read_file(path: str) -> str:
@@ -25,6 +98,101 @@ def read_file(path: str) -> str:
         return f.read()
 
 
+# Runs the snippet piped on stdin as __main__ of a fresh interpreter
+_WORKER_BOOTSTRAP = (
+    "import sys\n"
+    "code = sys.stdin.read()\n"
+    "sys.stdin = open(__import__('os').devnull)\n"
+    "exec(compile(code, '<snippet>', 'exec'),"
+    " {'__name__': '__main__', '__file__': '<snippet>', '__builtins__': __builtins__})\n"
+)
+
+
+class _CodeExecutorPool:
+    """
+    Interpreters started ahead of time for execute_code.
+
+    Each worker runs a single snippet and exits, so snippets stay as
+    isolated as with one subprocess per call; only the interpreter
+    startup is moved off the critical path. Replacements are started on
+    a background thread as soon as a worker is taken.
+    """
+
+    def __init__(self, size: int):
+        self._size = size
+        self._idle: List[subprocess.Popen] = []
+        self._starting = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    def run(self, code: str, timeout: int) -> subprocess.CompletedProcess:
+        """Run code on a warm worker, like subprocess.run with captured output."""
+        with self._lock:
+            worker = self._idle.pop() if self._idle else None
+
+            # Reserve the missing slots so concurrent callers don't overfill
+            missing = self._size - len(self._idle) - self._starting
+            self._starting += max(0, missing)
+
+        if missing > 0:
+            threading.Thread(target=self._refill, args=(missing,), daemon=True).start()
+
+        if worker is None:
+            worker = self._spawn()
+
+        try:
+            stdout, stderr = worker.communicate(code, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+            worker.communicate()
+            raise
+
+        return subprocess.CompletedProcess(worker.args, worker.returncode, stdout, stderr)
+
+    def close(self) -> None:
+        """Stop idle workers."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+
+        for worker in idle:
+            worker.kill()
+            worker.communicate()
+
+    def _refill(self, count: int) -> None:
+        for _ in range(count):
+            try:
+                worker = self._spawn()
+            except OSError:
+                with self._lock:
+                    self._starting -= 1
+                continue
+
+            with self._lock:
+                self._starting -= 1
+
+                if not self._closed:
+                    self._idle.append(worker)
+                    continue
+
+            worker.kill()
+            worker.communicate()
+
+    @staticmethod
+    def _spawn() -> subprocess.Popen:
+        return subprocess.Popen(
+            ['python', '-c', _WORKER_BOOTSTRAP],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True
+        )
+
+
+_executor_pool = _CodeExecutorPool(size=config.code_executor_workers)
+
+
 def execute_code(
     code: str,
     timeout: int = 30,
@@ -36,6 +204,9 @@ def execute_code(
     SECURITY NOTE: This should be properly sandboxed in production.
     For this assessment, basic subprocess isolation is acceptable.
 
+    Captured runs use a pre-started interpreter from the executor pool;
+    the code is piped to it instead of going through a temp file.
+
     Args:
         code: Python code to execute
         timeout: Execution timeout in seconds
@@ -44,17 +215,16 @@ def execute_code(
     Returns:
         Dictionary with execution results
     """
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-        f.write(code)
-        temp_path = f.name
-
     try:
-        result = subprocess.run(
-            ['python', temp_path],
-            capture_output=capture_output,
-            timeout=timeout,
-            text=True
-        )
+        if capture_output:
+            result = _executor_pool.run(code, timeout)
+        else:
+            result = subprocess.run(
+                ['python', '-c', _WORKER_BOOTSTRAP],
+                input=code,
+                timeout=timeout,
+                text=True
+            )
         return {
             "success": result.returncode == 0,
             "stdout": result.stdout,
@@ -71,28 +241,44 @@ def execute_code(
             "success": False,
             "error": str(e)
         }
-    finally:
-        os.unlink(temp_path)
 
 
-def parse_python_ast(code: str) -> Dict[str, Any]:
+def parse_python_ast(code: str, ctx: Optional[CodeContext] = None) -> Dict[str, Any]:
     """
     Parse Python code into AST and extract structure.
 
+    Results are cached by content hash, so agents asking about the same
+    source repeatedly only parse it once.
+
     Args:
         code: Python code to parse
+        ctx: Precomputed CodeContext for ``code``; reuses its hash and tree
 
     Returns:
         Dictionary with code structure information
     """
+    code_hash = ctx.digest if ctx is not None else _digest(code)
+    structure = _ast_cache.get(code_hash)
+
+    if structure is None:
+        structure = _parse_structure(code, ctx.tree if ctx is not None else None)
+        _ast_cache.set(code_hash, structure)
+
+    # Callers get their own copy; the cached structure stays intact
+    return copy.deepcopy(structure)
+
+
+def _parse_structure(code: str, tree: Optional[ast.Module] = None) -> Dict[str, Any]:
+    """Uncached body of parse_python_ast."""
     try:
-        tree = ast.parse(code)
+        if tree is None:
+            tree = ast.parse(code)
 
         functions = []
         classes = []
         imports = []
 
-        for node in ast.walk(tree):
+        for node in _walk_statements(tree):
             if isinstance(node, ast.FunctionDef):
                 functions.append({
                     "name": node.name,
@@ -115,7 +301,7 @@ def parse_python_ast(code: str) -> Dict[str, Any]:
             "functions": functions,
             "classes": classes,
             "imports": imports,
-            "line_count": len(code.split('\n'))
+            "line_count": code.count('\n') + 1
         }
 
     except SyntaxError as e:
@@ -125,6 +311,27 @@ def parse_python_ast(code: str) -> Dict[str, Any]:
         }
 
 
+def _walk_statements(tree: ast.AST):
+    """
+    Breadth-first walk over statement nodes only.
+
+    Yields definitions and imports in the same order as ast.walk, but
+    never descends into expressions, which make up most of the tree.
+    """
+    queue = deque([tree])
+
+    while queue:
+        node = queue.popleft()
+
+        for field in node._fields:
+            value = getattr(node, field, None)
+
+            if isinstance(value, list):
+                queue.extend(child for child in value if isinstance(child, _STMT_NODES))
+
+        yield node
+
+
 def get_line_range(code: str, start: int, end: int) -> str:
     """
     Extract a range of lines from code.
@@ -137,10 +344,51 @@ def get_line_range(code: str, start: int, end: int) -> str:
     Returns:
         Extracted code lines
     """
-    lines = code.split('\n')
+    lines, _ = _line_index(code)
     return '\n'.join(lines[start-1:end])
 
 
+# Syntax that sees past line boundaries in a whole-buffer search:
+# \A and \Z anchor to the buffer, lookbehind can read the previous
+# line and lookahead the next one, and \B matches inside an empty line
+# of the buffer but not in the empty string
+_PER_LINE_SYNTAX = ("\\A", "\\Z", "\\B", "(?<", "(?=", "(?!")
+
+
+def _matching_lines(code: str, regex: re.Pattern) -> List[int]:
+    """
+    Line numbers (1-indexed) where ``regex`` matches, one per line.
+
+    Searches the whole buffer instead of each line: after a match the
+    search resumes at the start of the next line, and match offsets are
+    mapped to lines by bisecting the cached line starts. Results are the
+    same as searching line by line: a match that runs past its line
+    only counts if the line matches on its own. Patterns using \\A, \\Z,
+    \\B or lookaround are searched line by line.
+    """
+    lines, starts = _line_index(code)
+
+    if any(syntax in regex.pattern for syntax in _PER_LINE_SYNTAX):
+        return [n for n, line in enumerate(lines, 1) if regex.search(line)]
+
+    found = []
+    pos = 0
+
+    while (match := regex.search(code, pos)) is not None:
+        line = bisect.bisect_right(starts, match.start())
+        line_end = starts[line] - 1 if line < len(starts) else len(code)
+
+        if match.end() <= line_end or regex.search(code, starts[line - 1], line_end):
+            found.append(line)
+
+        if line >= len(starts):
+            break
+
+        pos = starts[line]
+
+    return found
+
+
 def find_pattern(code: str, pattern: str) -> list:
     """
     Find occurrences of a pattern in code.
@@ -152,18 +400,33 @@ def find_pattern(code: str, pattern: str) -> list:
     Returns:
         List of matches with line numbers
     """
-    import re
+    lines, _ = _line_index(code)
+
+    return [
+        {"line": line, "content": lines[line - 1].strip()}
+        for line in _matching_lines(code, _compile(pattern, re.MULTILINE))
+    ]
 
-    matches = []
-    lines = code.split('\n')
 
-    for i, line in enumerate(lines, 1):
-        if re.search(pattern, line):
-            matches.append({
-                "line": i,
-                "content": line.strip()
-            })
+def find_patterns_batch(code: str, patterns: List[str]) -> list:
+    """
+    Find occurrences of several patterns in code in one call.
 
+    Args:
+        code: Code to search
+        patterns: Regex patterns to find
+
+    Returns:
+        List of matches with pattern and line numbers, ordered by line
+    """
+    lines, _ = _line_index(code)
+    matches = [
+        {"pattern": pattern, "line": line, "content": lines[line - 1].strip()}
+        for pattern in patterns
+        for line in _matching_lines(code, _compile(pattern, re.MULTILINE))
+    ]
+
+    matches.sort(key=lambda match: match["line"])
     return matches
 
 
@@ -232,6 +495,25 @@ TOOL_DEFINITIONS = [
             },
             "required": ["code", "pattern"]
         }
+    },
+    {
+        "name": "find_patterns_batch",
+        "description": "Find occurrences of several regex patterns in code at once",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "Code to search"
+                },
+                "patterns": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Regex patterns to find"
+                }
+            },
+            "required": ["code", "patterns"]
+        }
     }
 ]
 
@@ -242,6 +524,7 @@ TOOL_HANDLERS = {
     "execute_code": execute_code,
     "parse_python_ast": parse_python_ast,
     "find_pattern": find_pattern,
+    "find_patterns_batch": find_patterns_batch,
     "get_line_range": get_line_range
 }
 
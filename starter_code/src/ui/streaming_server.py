@@ -1,29 +1,35 @@
 """
 Streaming server for real-time UI updates.
 
-TODO: Implement the streaming server.
+Events are streamed to clients as Server-Sent Events (SSE) on
+``GET /events``.
 """
 
-from typing import Optional
+from typing import Optional, Set
 import asyncio
-import json
+import socket
 
+from ..config import config
 from ..events import EventBus, Event
 
 
 class StreamingServer:
     """
-    Server that streams events to the UI.
+    Server that streams events to the UI over Server-Sent Events.
 
-    Supports either:
-    - WebSocket connections
-    - Server-Sent Events (SSE)
-
-    Choose one approach and implement it.
-
-    TODO: Complete the implementation
+    Each client gets its own bounded event bus queue, so a slow client
+    only loses its own oldest events and never holds up the agents.
+    Events are coalesced for up to ``sse_batch_window_ms`` and written
+    together. Client sockets get a send buffer large enough for the
+    bandwidth-delay product of distant clients, while TCP_NOTSENT_LOWAT
+    keeps the backlog in the event queue, where stale events can be
+    dropped, rather than in the kernel.
     """
 
+    # Comment line sent when no event arrived for this long, so proxies
+    # and clients keep idle connections open
+    keepalive_seconds: float = 15.0
+
     def __init__(self, event_bus: EventBus, host: str = "localhost", port: int = 8080):
         """
         Initialize the streaming server.
@@ -31,46 +37,139 @@ class StreamingServer:
         Args:
             event_bus: Event bus to stream events from
             host: Host to bind to
-            port: Port to bind to
+            port: Port to bind to (0 picks a free port)
         """
         self.event_bus = event_bus
         self.host = host
         self.port = port
         self._running = False
+        self._runner = None
+        self._clients: Set[asyncio.Task] = set()
+        self._started = asyncio.Event()
+        self._stopped = asyncio.Event()
 
     async def start(self) -> None:
         """
-        Start the streaming server.
-
-        TODO: Implement server startup
-        - Start WebSocket or HTTP server
-        - Begin streaming events from event bus
+        Start the streaming server and serve until stop() is called.
         """
-        raise NotImplementedError("Implement streaming server startup")
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/events", self._handle_sse)
+
+        self._runner = web.AppRunner(app, handle_signals=False)
+        await self._runner.setup()
+
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+
+        # Report the real port when binding to port 0
+        self.port = self._runner.addresses[0][1]
+        self._running = True
+        self._started.set()
+
+        try:
+            await self._stopped.wait()
+        finally:
+            self._running = False
+
+            # Idle streams would otherwise hold shutdown until keepalive
+            for client in self._clients:
+                client.cancel()
+
+            await self._runner.cleanup()
+
+    async def wait_started(self) -> None:
+        """Wait until the server accepts connections."""
+        await self._started.wait()
 
     async def stop(self) -> None:
         """Stop the streaming server."""
         self._running = False
-
-    async def _handle_websocket(self, websocket, path):
-        """
-        Handle a WebSocket connection.
-
-        TODO: Implement WebSocket handling
-        - Stream events to connected client
-        - Handle disconnection gracefully
-        """
-        raise NotImplementedError("Implement WebSocket handling")
+        self._stopped.set()
 
     async def _handle_sse(self, request):
         """
         Handle an SSE connection.
 
-        TODO: Implement SSE handling
-        - Return streaming response
-        - Format events as SSE
+        Streams every event published on the bus until the client
+        disconnects or the server stops.
         """
-        raise NotImplementedError("Implement SSE handling")
+        from aiohttp import web
+
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        })
+
+        # Subscribe before answering, so the client sees every event
+        # published once the headers arrive
+        queue = self.event_bus.subscribe()
+        self._clients.add(asyncio.current_task())
+
+        try:
+            self._tune_socket(request.transport)
+            await response.prepare(request)
+
+            while self._running:
+                try:
+                    event = await asyncio.wait_for(queue.get(), self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    await response.write(b": keepalive\n\n")
+                    continue
+
+                # Coalesce what arrives within the batch window into one write
+                events = [event]
+                if config.sse_batch_window_ms > 0:
+                    await asyncio.sleep(config.sse_batch_window_ms / 1000)
+
+                while len(events) < config.sse_batch_max_events and not queue.empty():
+                    events.append(queue.get_nowait())
+
+                try:
+                    await response.write(b"".join(self._format_sse(e) for e in events))
+                finally:
+                    for _ in events:
+                        queue.task_done()
+
+        except ConnectionResetError:
+            pass
+
+        finally:
+            self._clients.discard(asyncio.current_task())
+            self.event_bus.unsubscribe(queue)
+
+        return response
+
+    @staticmethod
+    def _tune_socket(transport) -> None:
+        """Apply the configured send buffer settings to a client socket."""
+        sock = transport.get_extra_info("socket") if transport is not None else None
+
+        if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+            return
+
+        try:
+            if config.sse_send_buffer_bytes > 0:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, config.sse_send_buffer_bytes)
+
+            lowat = getattr(socket, "TCP_NOTSENT_LOWAT", None)
+            if lowat is not None and config.sse_notsent_lowat_bytes > 0:
+                sock.setsockopt(socket.IPPROTO_TCP, lowat, config.sse_notsent_lowat_bytes)
+
+        except OSError:
+            # Tuning is best effort; the stream works with OS defaults
+            pass
+
+    @staticmethod
+    def _format_sse(event: Event) -> bytes:
+        """Encode one event as an SSE message."""
+        return (
+            f"id: {event.event_id}\nevent: {event.event_type.value}\ndata: ".encode()
+            + event.to_bytes()
+            + b"\n\n"
+        )
 
 
 class ConsoleStreamingUI:
@@ -86,15 +185,46 @@ class ConsoleStreamingUI:
 
     def __init__(self, event_bus: EventBus):
         """Initialize the console UI."""
+        from rich.console import Console
+
         self.event_bus = event_bus
+        self._console = Console()
+        self._task: Optional[asyncio.Task] = None
         self._setup_subscribers()
 
     def _setup_subscribers(self):
         """Set up event subscriptions."""
-        from ..events import EventType
+        # Subscribe to all events for display. Events are queued and
+        # rendered by the consumer task, so publishing agents never
+        # wait on terminal output.
+        self._queue = self.event_bus.subscribe()
+
+    def start(self) -> None:
+        """Start rendering events on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._consume())
 
-        # Subscribe to all events for display
-        self.event_bus.subscribe(self._handle_event, None)
+    async def stop(self) -> None:
+        """Render the events already published, then stop."""
+        if self._task is None:
+            return
+
+        await self._queue.join()
+        self._task.cancel()
+        self._task = None
+        self.event_bus.unsubscribe(self._queue)
+
+    async def _consume(self) -> None:
+        while True:
+            event = await self._queue.get()
+
+            try:
+                self._handle_event(event)
+            except Exception:
+                # A rendering problem must not stop the UI
+                pass
+            finally:
+                self._queue.task_done()
 
     def _handle_event(self, event: Event) -> None:
         """
@@ -105,10 +235,9 @@ class ConsoleStreamingUI:
         - Show different event types differently
         - Update status panels
         """
-        from rich.console import Console
         from rich.panel import Panel
 
-        console = Console()
+        console = self._console
 
         # Basic implementation - enhance as needed
         event_type = event.event_type.value
@@ -0,0 +1,15 @@
+"""
+Shared test fixtures.
+"""
+
+import pytest
+
+from src.config import config
+
+
+@pytest.fixture(autouse=True)
+def findings_cache_path(monkeypatch, tmp_path):
+    """Keep the persistent findings cache out of the user's home directory."""
+    path = str(tmp_path / "findings.sqlite3")
+    monkeypatch.setattr(config, "findings_cache_path", path)
+    return path
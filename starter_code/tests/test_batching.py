@@ -0,0 +1,50 @@
+"""
+Tests for the @batched decorator.
+"""
+
+import asyncio
+import pytest
+
+from src.llm.batching import batched
+
+
+class Doubler:
+    """Records each batch it is called with."""
+
+    def __init__(self):
+        self.batches = []
+
+    @batched(max_batch_size=3, wait_ms=10)
+    async def double(self, items):
+        self.batches.append(items)
+        return [item * 2 for item in items]
+
+
+class TestBatched:
+    """Tests for batched."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_a_batch(self):
+        """Concurrent calls are coalesced and results routed back in order."""
+        doubler = Doubler()
+
+        results = await asyncio.gather(*(doubler.double(i) for i in range(4)))
+
+        assert results == [0, 2, 4, 6]
+        assert doubler.batches == [[0, 1, 2], [3]]
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """An exception in the batch function is raised for each caller."""
+
+        class Failing:
+            @batched(wait_ms=1)
+            async def run(self, items):
+                raise RuntimeError("boom")
+
+        failing = Failing()
+        results = await asyncio.gather(
+            failing.run(1), failing.run(2), return_exceptions=True
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
@@ -0,0 +1,72 @@
+"""
+Tests for BugAgent.
+"""
+
+import asyncio
+import pytest
+
+from src.agents.bug_agent import BugAgent
+from src.events import EventBus
+from src.llm.base import LLMClient
+
+
+class FakeLLM(LLMClient):
+    """Returns a canned response and counts calls."""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    async def generate(self, system_prompt, user_prompt, tools=None):
+        self.calls += 1
+        return self.response
+
+
+@pytest.fixture
+def make_agent(monkeypatch):
+    """Build a BugAgent backed by a FakeLLM."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    def factory(response="[]"):
+        agent = BugAgent(EventBus())
+        agent._llm = FakeLLM(response)
+        return agent
+
+    return factory
+
+
+class TestBugAgent:
+    """Tests for BugAgent detection."""
+
+    @pytest.mark.asyncio
+    async def test_non_dict_elements_are_skipped(self, make_agent):
+        """Scalars in the array are dropped; each finding is reported once."""
+        agent = make_agent('[1, {"id": "b1", "line": 2}, ["x"]]')
+        reported = []
+
+        async def on_finding(finding):
+            reported.append(finding["id"])
+
+        findings, error = await agent._detect_single("x = 1", on_finding)
+
+        assert error is None
+        assert [f["id"] for f in findings] == ["b1"]
+        assert reported == ["b1"]
+
+    @pytest.mark.asyncio
+    async def test_batched_non_dict_elements_are_skipped(self, make_agent):
+        """Per-snippet arrays in a batched response are filtered the same way."""
+        agent = make_agent('[[1, {"id": "b1", "line": 1}], ["x", {"id": "b2", "line": 1}]]')
+        reported = []
+
+        async def on_finding(finding):
+            reported.append(finding["id"])
+
+        results = await asyncio.gather(
+            agent._detect_bugs(("x = 1", on_finding)),
+            agent._detect_bugs(("y = 2", on_finding)),
+        )
+
+        assert agent._llm.calls == 1
+        assert [[f["id"] for f in findings] for findings, _ in results] == [["b1"], ["b2"]]
+        assert reported == ["b1", "b2"]
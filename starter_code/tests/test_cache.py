@@ -0,0 +1,104 @@
+"""
+Tests for the findings caches.
+"""
+
+from src.cache import SemanticCache, TTLCache, content_key, fingerprint
+
+
+class TestFingerprint:
+    """Tests for code fingerprinting."""
+
+    def test_ignores_formatting_and_comments(self):
+        """Indentation, trailing spaces and comments do not matter."""
+        a = "\n    x = 1  # note\n    if x:\n        y = 2\n"
+        b = "\nx = 1\nif x:\n  y = 2   \n"
+
+        assert fingerprint(a) == fingerprint(b)
+
+    def test_block_structure_matters(self):
+        """Dedenting a statement out of a block changes the fingerprint."""
+        inside = "if a:\n    x()\n    y()\n"
+        after = "if a:\n    x()\ny()\n"
+
+        assert fingerprint(inside) != fingerprint(after)
+
+    def test_line_positions_matter(self):
+        """Moving code to other lines changes the fingerprint."""
+        assert fingerprint("\nx = 1\n") != fingerprint("x = 1\n")
+
+
+class TestContentKey:
+    """Tests for content_key."""
+
+    def test_agent_type_and_options_are_part_of_the_key(self):
+        """Same code under other agents or options gets another key."""
+        key = content_key("x = 1", "security", {"depth": 1})
+
+        assert key == content_key("x = 1", "security", {"depth": 1})
+        assert key != content_key("x = 1", "coordinator", {"depth": 1})
+        assert key != content_key("x = 1", "security", {"depth": 2})
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache."""
+
+    def test_round_trip(self):
+        """Test storing and loading findings."""
+        cache = SemanticCache(":memory:")
+        findings = [{"id": "b1", "line": 2}]
+
+        cache.put("bug", "x = 1", findings)
+
+        assert cache.get("bug", "x = 1") == findings
+        assert cache.get("security", "x = 1") is None
+
+    def test_expired_entries_are_ignored(self):
+        """Test TTL expiry."""
+        cache = SemanticCache(":memory:", ttl_seconds=-1)
+        cache.put("bug", "x = 1", [])
+
+        assert cache.get("bug", "x = 1") is None
+
+    def test_file_caches_share_one_connection(self, tmp_path):
+        """Caches on the same file reuse one WAL-mode connection."""
+        path = str(tmp_path / "findings.sqlite3")
+        first = SemanticCache(path)
+        second = SemanticCache(path)
+
+        first.put("bug", "x = 1", [])
+
+        assert second._conn is first._conn
+        assert second.get("bug", "x = 1") == []
+        assert first._conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+    def test_missing_cache_directory_is_created(self, tmp_path):
+        """The parent directories of a new cache file are created."""
+        cache = SemanticCache(str(tmp_path / "new" / "sub" / "findings.sqlite3"))
+
+        cache.put("bug", "x = 1", [])
+
+        assert (tmp_path / "new" / "sub").is_dir()
+        assert cache.get("bug", "x = 1") == []
+
+
+class TestTTLCache:
+    """Tests for TTLCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test LRU eviction at maxsize."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+    def test_expired_entries_are_ignored(self):
+        """Test TTL expiry."""
+        cache = TTLCache(ttl=0)
+        cache.set("a", 1)
+
+        assert cache.get("a") is None
@@ -0,0 +1,174 @@
+"""
+Tests for agent code tools.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.tools import code_tools
+from src.tools.code_tools import execute_code, parse_python_ast
+
+
+SAMPLE = "import os\n\nclass A:\n    def f(self, x):\n        return x\n"
+
+
+class TestParsePythonAst:
+    """Tests for parse_python_ast."""
+
+    def test_structure(self):
+        """Functions, classes and imports are extracted."""
+        result = parse_python_ast(SAMPLE)
+
+        assert result["success"]
+        assert result["functions"] == [{"name": "f", "line": 4, "args": ["self", "x"]}]
+        assert result["classes"] == [{"name": "A", "line": 3}]
+        assert result["imports"] == ["os"]
+
+    def test_repeated_calls_parse_once(self, monkeypatch):
+        """The same source is parsed once; callers cannot corrupt the cache."""
+        calls = []
+        parse = code_tools._parse_structure
+
+        def counting_parse(code, tree=None):
+            calls.append(code)
+            return parse(code, tree)
+
+        monkeypatch.setattr(code_tools, "_parse_structure", counting_parse)
+        source = SAMPLE + "# repeated\n"
+
+        first = parse_python_ast(source)
+        first["functions"].clear()
+        second = parse_python_ast(source)
+
+        assert len(calls) == 1
+        assert len(second["functions"]) == 1
+
+    def test_nested_definitions(self):
+        """Definitions inside blocks and handlers are found in walk order."""
+        code = (
+            "try:\n    import a\nexcept ImportError:\n    def g():\n        pass\n"
+            "if True:\n    class B:\n        def h(self):\n            f = lambda: 1\n"
+        )
+
+        result = parse_python_ast(code)
+
+        assert [f["name"] for f in result["functions"]] == ["g", "h"]
+        assert [c["name"] for c in result["classes"]] == ["B"]
+        assert result["imports"] == ["a"]
+
+    def test_code_context_tree_is_reused(self, monkeypatch):
+        """With a CodeContext, the source is not parsed again."""
+        source = SAMPLE + "# with context\n"
+        ctx = code_tools.CodeContext.build(source)
+        monkeypatch.setattr(code_tools.ast, "parse", None)
+
+        result = parse_python_ast(source, ctx=ctx)
+
+        assert [c["name"] for c in result["classes"]] == ["A"]
+        assert ctx.lines[2] == "class A:"
+        assert code_tools.CodeContext.of(source, {"code_ctx": ctx}) is ctx
+        assert code_tools.CodeContext.of("other", {"code_ctx": ctx}) is None
+
+    def test_syntax_error(self):
+        """Unparseable code reports an error."""
+        assert not parse_python_ast("def (")["success"]
+
+
+class TestLineTools:
+    """Tests for get_line_range and find_pattern."""
+
+    def test_get_line_range(self):
+        """Line ranges are 1-indexed and inclusive."""
+        assert code_tools.get_line_range(SAMPLE, 3, 4) == "class A:\n    def f(self, x):"
+
+    def test_find_pattern(self):
+        """Matches report their line and stripped content."""
+        assert code_tools.find_pattern(SAMPLE, r"return \w+") == [
+            {"line": 5, "content": "return x"}
+        ]
+
+    def test_line_index_offsets(self):
+        """Line start offsets point at the first character of each line."""
+        lines, starts = code_tools._line_index(SAMPLE)
+
+        assert [SAMPLE[offset:offset + len(line)] for line, offset in zip(lines, starts)] == list(lines)
+
+    def test_find_pattern_is_per_line(self):
+        """Matches never run across line breaks."""
+        code = "x = 1\n\ny = 'a'  \npassword\n = 'b'\n"
+
+        assert [m["line"] for m in code_tools.find_pattern(code, r"\s+$")] == [3]
+        assert code_tools.find_pattern(code, r"password\s*=") == []
+        assert [m["line"] for m in code_tools.find_pattern(code, r"^")] == [1, 2, 3, 4, 5, 6]
+
+    def test_find_pattern_line_anchors_and_lookbehind(self):
+        """\\A, \\Z, \\B and lookaround apply to each line, not the whole buffer."""
+        code = "\naaax\nb\nab\n"
+
+        assert [m["line"] for m in code_tools.find_pattern(code, r"\Aa")] == [2, 4]
+        assert [m["line"] for m in code_tools.find_pattern(code, r"b\Z")] == [3, 4]
+        assert code_tools.find_pattern(code, r"(?<=\n)b") == []
+        assert [m["line"] for m in code_tools.find_pattern("xa\nb", r"a(?!\s)")] == [1]
+        assert code_tools.find_pattern("ab\ncd", r"b(?=\n)") == []
+        assert code_tools.find_pattern("a\n\nb", r"\B") == []
+
+    def test_find_patterns_batch(self):
+        """Batch matches agree with find_pattern and are ordered by line."""
+        patterns = [r"return \w+", r"^import", r"self"]
+
+        matches = code_tools.find_patterns_batch(SAMPLE, patterns)
+
+        assert [(m["pattern"], m["line"]) for m in matches] == [
+            (r"^import", 1), (r"self", 4), (r"return \w+", 5)
+        ]
+        for pattern in patterns:
+            assert [
+                {"line": m["line"], "content": m["content"]}
+                for m in matches if m["pattern"] == pattern
+            ] == code_tools.find_pattern(SAMPLE, pattern)
+
+
+class TestExecuteCode:
+    """Tests for execute_code."""
+
+    def test_output_and_exit_code(self):
+        """Output and exit status come back from the worker."""
+        result = execute_code("import sys\nprint(__name__)\nsys.exit(3)")
+
+        assert result == {"success": False, "stdout": "__main__\n", "stderr": "", "return_code": 3}
+
+    def test_snippets_are_isolated(self):
+        """State from one snippet is not visible to the next."""
+        execute_code("import builtins\nbuiltins.leaked = 1")
+
+        result = execute_code("import builtins\nprint(hasattr(builtins, 'leaked'))")
+
+        assert result["stdout"] == "False\n"
+
+    def test_timeout(self):
+        """Runaway code is killed."""
+        result = execute_code("while True:\n    pass", timeout=1)
+
+        assert result == {"success": False, "error": "Execution timed out after 1 seconds"}
+
+    def test_file_is_defined(self):
+        """Snippets see __file__, as when run from a file."""
+        assert execute_code("print(__file__)")["stdout"] == "<snippet>\n"
+
+    def test_pool_is_refilled_without_overfilling(self):
+        """Concurrent runs keep at most ``size`` idle workers."""
+        pool = code_tools._CodeExecutorPool(size=2)
+
+        try:
+            with ThreadPoolExecutor(4) as executor:
+                results = list(executor.map(lambda _: pool.run("print(1)", 10), range(4)))
+
+            deadline = time.monotonic() + 10
+
+            while pool._starting and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            assert [r.stdout for r in results] == ["1\n"] * 4
+            assert len(pool._idle) == 2
+        finally:
+            pool.close()
@@ -0,0 +1,141 @@
+"""
+Tests for CoordinatorAgent plan execution.
+"""
+
+import asyncio
+import json
+import pytest
+
+from src.agents.base_agent import BaseAgent
+from src.agents.coordinator import CoordinatorAgent
+from src.context.shared_context import SharedContext
+from src.events import EventBus
+
+
+class RecordingAgent(BaseAgent):
+    """Specialist that records when it was run."""
+
+    def __init__(self, event_bus, name, log):
+        super().__init__(name, name, {}, event_bus)
+        self._log = log
+
+    @property
+    def system_prompt(self) -> str:
+        return ""
+
+    async def analyze(self, code, context=None):
+        self._log.append(self.agent_type)
+        return {"findings": []}
+
+
+@pytest.fixture
+def coordinator(monkeypatch):
+    """Coordinator with a dummy API key (no requests are made)."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    return CoordinatorAgent(EventBus())
+
+
+def _step(step_id, *deps):
+    return {"step_id": step_id, "agent_type": step_id, "depends_on": list(deps)}
+
+
+class TestExecutePlan:
+    """Tests for dependency-aware scheduling."""
+
+    @pytest.mark.asyncio
+    async def test_dependencies_run_first(self, coordinator):
+        """Steps only start once all their dependencies finished."""
+        log = []
+
+        for name in ("a", "b", "c"):
+            coordinator.register_specialist(
+                name, RecordingAgent(coordinator.event_bus, name, log)
+            )
+
+        plan = {"steps": [_step("c", "a", "b"), _step("b", "a"), _step("a")]}
+
+        await coordinator._execute_plan(plan, "x = 1", {})
+
+        assert log == ["a", "b", "c"]
+
+    @pytest.mark.asyncio
+    async def test_unknown_dependency_is_rejected(self, coordinator):
+        """Dependencies on missing steps fail fast."""
+        with pytest.raises(RuntimeError):
+            await coordinator._execute_plan(
+                {"steps": [_step("a", "missing")]}, "x = 1", {}
+            )
+
+    @pytest.mark.asyncio
+    async def test_cycle_is_reported(self, coordinator):
+        """Cyclic plans raise instead of hanging."""
+        with pytest.raises(RuntimeError, match="Deadlock"):
+            await coordinator._execute_plan(
+                {"steps": [_step("a", "b"), _step("b", "a")]}, "x = 1", {}
+            )
+
+
+class TestStreamedPlan:
+    """Tests for planning while streaming."""
+
+    @pytest.mark.asyncio
+    async def test_cancel_while_planning_stops_started_steps(
+        self, coordinator, monkeypatch
+    ):
+        """Cancelling the review cancels steps the stream already started."""
+        started, stopped = asyncio.Event(), asyncio.Event()
+
+        class BlockingAgent(RecordingAgent):
+            async def analyze(self, code, context=None):
+                started.set()
+                try:
+                    await asyncio.Event().wait()
+                finally:
+                    stopped.set()
+
+        coordinator.register_specialist(
+            "a", BlockingAgent(coordinator.event_bus, "a", [])
+        )
+
+        async def call_llm(prompt, on_chunk=None, **kwargs):
+            await on_chunk('{"steps": [' + json.dumps(_step("a")))
+            await asyncio.Event().wait()
+
+        monkeypatch.setattr(coordinator, "_call_llm", call_llm)
+        review = asyncio.create_task(
+            coordinator._plan_and_execute("x = 1", {"no_cache": True})
+        )
+
+        await asyncio.wait_for(started.wait(), 1)
+        review.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await review
+
+        await asyncio.wait_for(stopped.wait(), 1)
+
+
+class TestAsyncMode:
+    """Tests for background reviews."""
+
+    @pytest.mark.asyncio
+    async def test_async_mode_returns_task_handle(self, coordinator, monkeypatch):
+        """The caller gets a task id at once and polls for the report."""
+
+        async def no_plan(code, context):
+            return {"steps": []}
+
+        monkeypatch.setattr(coordinator, "_plan_and_execute", no_plan)
+        context = {"shared_context": SharedContext("x = 1"), "async_mode": True}
+
+        handle = await coordinator.analyze("x = 1", context)
+
+        assert handle["status"] == "queued"
+        assert coordinator.get_task(handle["task_id"])["status"] == "running"
+
+        report = await coordinator._tasks.wait(handle["task_id"])
+        state = coordinator.get_task(handle["task_id"])
+
+        assert state["status"] == "completed"
+        assert state["result"] == report
+        assert coordinator.get_task("unknown") is None
@@ -2,8 +2,11 @@
 Tests for the event system.
 """
 
+import asyncio
+import json
 import pytest
 from datetime import datetime
+from pathlib import Path
 
 from src.events import Event, EventType, EventBus
 
@@ -25,6 +28,12 @@ class TestEventTypes:
         assert event.event_id is not None
         assert event.timestamp is not None
 
+    def test_event_ids_are_unique(self):
+        """Test that each event gets a distinct id."""
+        ids = {Event(EventType.THINKING, "a", {}).event_id for _ in range(100)}
+
+        assert len(ids) == 100
+
     def test_event_to_dict(self):
         """Test event serialization to dict."""
         event = Event(
@@ -61,6 +70,28 @@ class TestEventTypes:
         assert event.event_type == EventType.THINKING
         assert event.agent_id == "coordinator"
         assert event.data["chunk"] == "Analyzing code..."
+        assert event.to_dict()["timestamp"] == "2024-01-15T10:30:00.000000Z"
+
+    def test_event_json_round_trip(self):
+        """Test JSON serialization, including values JSON cannot encode."""
+        event = Event(EventType.FINDING_DISCOVERED, "bug_agent", {"where": Path("a.py")})
+
+        restored = Event.from_dict(json.loads(event.to_bytes()))
+
+        assert event.to_json() == event.to_bytes().decode("utf-8")
+        assert restored.event_id == event.event_id
+        assert restored.data == {"where": "a.py"}
+        assert restored.timestamp // 1000 == event.timestamp // 1000
+
+    def test_events_dropped_serializes_int_keys(self):
+        """Per-subscriber drop counts keyed by int encode like json.dumps."""
+        event = Event(
+            event_type=EventType.EVENTS_DROPPED,
+            agent_id="event_bus",
+            data={"dropped": {3: 2}},
+        )
+
+        assert json.loads(event.to_bytes())["data"] == {"dropped": {"3": 2}}
 
 
 class TestEventBus:
@@ -86,10 +117,9 @@ class TestEventBus:
             data={}
         )
 
-        # Note: This test will need to be updated once EventBus is implemented
-        # event_bus.publish_sync(event)
-        # assert len(received_events) == 1
-        # assert received_events[0].agent_id == "test"
+        event_bus.publish_sync(event)
+        assert len(received_events) == 1
+        assert received_events[0].agent_id == "test"
 
     def test_filtered_subscription(self, event_bus):
         """Test subscribing to specific event types."""
@@ -102,17 +132,121 @@ class TestEventBus:
         event_bus.subscribe(callback, EventType.FINDING_DISCOVERED)
 
         # Publish different event types
-        # Note: Update once EventBus is implemented
-        # event_bus.publish_sync(Event(EventType.AGENT_STARTED, "a", {}))
-        # event_bus.publish_sync(Event(EventType.FINDING_DISCOVERED, "b", {}))
-        # event_bus.publish_sync(Event(EventType.THINKING, "c", {}))
+        event_bus.publish_sync(Event(EventType.AGENT_STARTED, "a", {}))
+        event_bus.publish_sync(Event(EventType.FINDING_DISCOVERED, "b", {}))
+        event_bus.publish_sync(Event(EventType.THINKING, "c", {}))
 
         # Should only receive the FINDING_DISCOVERED event
-        # assert len(received_events) == 1
-        # assert received_events[0].agent_id == "b"
+        assert len(received_events) == 1
+        assert received_events[0].agent_id == "b"
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_instead_of_blocking(self):
+        """Test that a slow subscriber does not block publishers."""
+        event_bus = EventBus(maxsize=2)
+        queue = event_bus.subscribe()
+
+        for i in range(5):
+            await event_bus.publish(
+                Event(event_type=EventType.THINKING, agent_id="a", data={"i": i})
+            )
+
+        assert queue.qsize() == 2
+        assert event_bus.dropped_events() == {0: 3}
+
+        # The oldest events are the ones dropped
+        assert [queue.get_nowait().data["i"] for _ in range(2)] == [3, 4]
+
+    @pytest.mark.asyncio
+    async def test_drops_are_reported_once(self):
+        """Each report carries only the drops since the previous one."""
+        event_bus = EventBus(maxsize=1, drop_report_interval=0)
+        event_bus.subscribe(event_type=EventType.THINKING)
+        reports = []
+        event_bus.subscribe(
+            lambda event: reports.append(event.data["dropped"]),
+            event_type=EventType.EVENTS_DROPPED,
+        )
+
+        for i in range(3):
+            await event_bus.publish(Event(EventType.THINKING, "a", {"i": i}))
+
+        await event_bus.publish(Event(EventType.AGENT_STARTED, "a", {}))
+
+        assert reports == [{0: 1}, {0: 1}]
+        assert event_bus.dropped_events() == {0: 2}
+
+    @pytest.mark.asyncio
+    async def test_drain_waits_for_consumers(self, event_bus):
+        """Test drain() returns once subscribers have processed all events."""
+        queue = event_bus.subscribe()
+        handled = []
+
+        async def consumer():
+            while True:
+                event = await queue.get()
+                await asyncio.sleep(0)
+                handled.append(event)
+                queue.task_done()
+
+        consumer_task = asyncio.create_task(consumer())
+
+        for _ in range(3):
+            await event_bus.publish(Event(EventType.THINKING, "a", {}))
+
+        await asyncio.wait_for(event_bus.drain(), timeout=1)
+        consumer_task.cancel()
+
+        assert len(handled) == 3
+
+    @pytest.mark.asyncio
+    async def test_publish_sync_from_thread(self, event_bus):
+        """Test publish_sync hands delivery to the loop from other threads."""
+        queue = event_bus.subscribe()
+
+        await asyncio.to_thread(
+            event_bus.publish_sync, Event(EventType.THINKING, "worker", {})
+        )
+
+        event = await asyncio.wait_for(queue.get(), timeout=1)
+        assert event.agent_id == "worker"
+
+    @pytest.mark.asyncio
+    async def test_filtered_callback_and_has_subscribers(self, event_bus):
+        """Test type-filtered callbacks and per-type subscriber tracking."""
+        received_events = []
+
+        assert not event_bus.has_subscribers(EventType.FINDING_DISCOVERED)
+
+        callback = event_bus.subscribe(received_events.append, EventType.FINDING_DISCOVERED)
+
+        assert event_bus.has_subscribers(EventType.FINDING_DISCOVERED)
+        assert not event_bus.has_subscribers(EventType.THINKING)
+
+        await event_bus.publish(Event(EventType.AGENT_STARTED, "a", {}))
+        await event_bus.publish(Event(EventType.FINDING_DISCOVERED, "b", {}))
+
+        assert [e.agent_id for e in received_events] == ["b"]
+
+        event_bus.unsubscribe(callback)
+
+        assert not event_bus.has_subscribers(EventType.FINDING_DISCOVERED)
 
     @pytest.mark.asyncio
     async def test_async_stream_events(self, event_bus):
         """Test async event streaming."""
         # Note: Implement once EventBus is complete
         pass
+
+    @pytest.mark.asyncio
+    async def test_raw_string_event_types(self, event_bus):
+        """Raw event type strings work as subscription filters."""
+        queue = event_bus.subscribe(event_type="thinking")
+
+        assert event_bus.has_subscribers(EventType.THINKING)
+
+        await event_bus.publish(Event(EventType.THINKING, "a", {}))
+        await event_bus.publish(Event(EventType.AGENT_STARTED, "a", {}))
+
+        assert queue.qsize() == 1
+        assert queue.get_nowait().event_type == "thinking"
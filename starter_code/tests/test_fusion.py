@@ -0,0 +1,65 @@
+"""
+Tests for fused multi-agent LLM calls.
+"""
+
+import asyncio
+import json
+import pytest
+
+from src.llm.fusion import LLMFuser
+
+
+class FakeLLM:
+    """Returns a canned response and records each prompt."""
+
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    async def generate(self, system_prompt, user_prompt, **kwargs):
+        self.prompts.append(user_prompt)
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+class TestLLMFuser:
+    """Tests for LLMFuser."""
+
+    @pytest.mark.asyncio
+    async def test_calls_share_one_request(self):
+        """Expected callers get their own slice of a single response."""
+        llm = FakeLLM(json.dumps({"0": [{"id": "s1"}], "1": []}))
+        fuser = LLMFuser(llm, "x = 1", expected=2, wait_ms=1000)
+
+        security, bug = await asyncio.gather(
+            fuser.call("security", "SEC", "Review:\nx = 1"),
+            fuser.call("bug", "BUG", "Review:\nx = 1"),
+        )
+
+        assert json.loads(security) == [{"id": "s1"}]
+        assert json.loads(bug) == []
+        assert len(llm.prompts) == 1
+        assert llm.prompts[0].count("x = 1") == 1
+
+    @pytest.mark.asyncio
+    async def test_single_caller_falls_back(self):
+        """A lone caller is told to make its own request after the wait."""
+        llm = FakeLLM("{}")
+        fuser = LLMFuser(llm, "x = 1", expected=2, wait_ms=5)
+
+        assert await fuser.call("security", "SEC", "x = 1") is None
+        assert llm.prompts == []
+
+    @pytest.mark.asyncio
+    async def test_failed_request_falls_back(self):
+        """Errors and missing tasks resolve to None; later calls bypass."""
+        fuser = LLMFuser(FakeLLM(RuntimeError("boom")), "x", expected=2)
+
+        results = await asyncio.gather(
+            fuser.call("security", "SEC", "x"),
+            fuser.call("bug", "BUG", "x"),
+        )
+
+        assert results == [None, None]
+        assert await fuser.call("bug", "BUG", "x") is None
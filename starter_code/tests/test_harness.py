@@ -6,17 +6,35 @@ This module provides tools to:
 - Compare findings against ground truth
 - Calculate precision, recall, and F1 scores
 - Generate evaluation reports
-
-TODO: Implement the test harness
 """
 
-import json
+import asyncio
+import re
+from collections import defaultdict
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, FrozenSet, List, Any, Tuple
 from dataclasses import dataclass
 
+import pytest
+
+from src.agents import BugAgent, CoordinatorAgent, SecurityAgent
+from src.context.shared_context import SharedContext
+from src.events import EventBus
+from src.llm.json_extract import loads
+
+
+# Lines a finding may be off by and still match an expected finding
+LINE_TOLERANCE = 3
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _words(text: str) -> FrozenSet[str]:
+    """Lowercase words of ``text`` ("SQL Injection" -> {"sql", "injection"})."""
+    return frozenset(_WORD_RE.findall(text.lower()))
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class EvaluationResult:
     """Result of evaluating findings against ground truth."""
     true_positives: int
@@ -49,8 +67,8 @@ class TestHarness:
 
     def _load_ground_truth(self, path: str) -> Dict[str, Any]:
         """Load ground truth from JSON file."""
-        with open(path, 'r') as f:
-            return json.load(f)
+        # Parsed straight from bytes (orjson when installed)
+        return loads(Path(path).read_bytes())
 
     async def evaluate_file(
         self,
@@ -60,10 +78,10 @@ class TestHarness:
         """
         Evaluate findings against ground truth for a file.
 
-        TODO: Implement evaluation logic
-        - Match findings to expected findings
-        - Calculate true positives, false positives, false negatives
-        - Compute precision, recall, F1
+        Each finding is matched to at most one expected finding near its
+        line (see _match_finding); expected findings are looked up by
+        line, so the cost grows with the number of findings rather than
+        their product.
 
         Args:
             file_path: Path to the file that was analyzed
@@ -77,14 +95,71 @@ class TestHarness:
         expected = self.ground_truth.get("files", {}).get(filename, {})
         expected_findings = expected.get("expected_findings", [])
 
-        # TODO: Implement matching logic
-        # Consider:
-        # - Exact line number match vs. approximate
-        # - Category/type matching
-        # - Severity matching
-        # - Partial credit for related findings
-
-        raise NotImplementedError("Implement evaluation logic")
+        # Index expected findings by every line they may be matched on,
+        # so each actual finding only looks at the few near its line
+        by_line: Dict[int, List[int]] = defaultdict(list)
+
+        for i, exp in enumerate(expected_findings):
+            start, end = self._line_span(exp)
+            if start is None:
+                continue
+
+            for line in range(start - LINE_TOLERANCE, end + LINE_TOLERANCE + 1):
+                by_line[line].append(i)
+
+        matched: Dict[int, float] = {}
+        details: List[Dict[str, Any]] = []
+
+        for actual in findings:
+            best, best_confidence = None, 0.0
+
+            for i in by_line.get(actual.get("line"), ()):
+                if i in matched:
+                    continue
+
+                is_match, confidence = self._match_finding(actual, expected_findings[i])
+                if is_match and confidence > best_confidence:
+                    best, best_confidence = i, confidence
+
+            if best is None:
+                details.append({
+                    "status": "FP",
+                    "title": actual.get("title") or actual.get("description", "Unknown"),
+                    "line": actual.get("line"),
+                })
+                continue
+
+            matched[best] = best_confidence
+            details.append({
+                "status": "TP",
+                "title": expected_findings[best].get("title", "Unknown"),
+                "line": actual.get("line"),
+                "confidence": best_confidence,
+            })
+
+        for i, exp in enumerate(expected_findings):
+            if i not in matched:
+                details.append({
+                    "status": "FN",
+                    "title": exp.get("title", "Unknown"),
+                    "line": exp.get("line_start"),
+                    "required": exp.get("required", False),
+                })
+
+        tp = len(matched)
+        fp = len(findings) - tp
+        fn = len(expected_findings) - tp
+        precision, recall, f1 = calculate_metrics(tp, fp, fn)
+
+        return EvaluationResult(
+            true_positives=tp,
+            false_positives=fp,
+            false_negatives=fn,
+            precision=precision,
+            recall=recall,
+            f1_score=f1,
+            details=details,
+        )
 
     def _match_finding(
         self,
@@ -94,7 +169,11 @@ class TestHarness:
         """
         Check if an actual finding matches an expected one.
 
-        TODO: Implement matching logic
+        A finding matches when it comes from the same kind of agent
+        (security/bug) and its line is within LINE_TOLERANCE of the
+        expected range. Confidence starts at 0.5 for the right place
+        and rises with how many words of the expected category the
+        finding's category, title or description mention.
 
         Args:
             actual: Finding from the system
@@ -103,7 +182,35 @@ class TestHarness:
         Returns:
             Tuple of (is_match, confidence_score)
         """
-        raise NotImplementedError("Implement finding matching")
+        line = actual.get("line")
+        start, end = self._line_span(expected)
+
+        if not isinstance(line, int) or start is None:
+            return False, 0.0
+
+        if not start - LINE_TOLERANCE <= line <= end + LINE_TOLERANCE:
+            return False, 0.0
+
+        agent_type, expected_type = actual.get("agent_type"), expected.get("type")
+        if agent_type and expected_type and agent_type != expected_type:
+            return False, 0.0
+
+        expected_words = _words(expected.get("category", ""))
+        if not expected_words:
+            return True, 0.5
+
+        actual_words = _words(" ".join(
+            str(actual.get(key, "")) for key in ("category", "title", "description")
+        ))
+        overlap = len(expected_words & actual_words) / len(expected_words)
+
+        return True, 0.5 + 0.5 * overlap
+
+    @staticmethod
+    def _line_span(expected: Dict[str, Any]) -> Tuple[Any, Any]:
+        """(first, last) line of an expected finding; (None, None) if unknown."""
+        start = expected.get("line_start", expected.get("line"))
+        return start, expected.get("line_end") or start
 
     def print_report(self, result: EvaluationResult) -> None:
         """
@@ -133,24 +240,51 @@ class TestHarness:
 
     async def run_full_evaluation(
         self,
-        test_dir: str
+        test_dir: str,
+        max_concurrency: int = 4
     ) -> Dict[str, EvaluationResult]:
         """
         Run evaluation on all test files.
 
-        TODO: Implement full evaluation
-        - Find all test files
-        - Run analysis on each
-        - Evaluate results
-        - Aggregate metrics
+        Files are analyzed concurrently: each review spends its time
+        waiting on LLM responses, so up to ``max_concurrency`` of them
+        share one event loop.
 
         Args:
             test_dir: Directory containing test files
+            max_concurrency: Files analyzed at once
 
         Returns:
             Dictionary mapping filename to results
         """
-        raise NotImplementedError("Implement full evaluation")
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def evaluate(path: Path) -> Tuple[str, EvaluationResult]:
+            async with semaphore:
+                findings = await self._analyze(path)
+
+            return path.name, await self.evaluate_file(str(path), findings)
+
+        paths = sorted(Path(test_dir).glob("*.py"))
+        results = await asyncio.gather(*(evaluate(path) for path in paths))
+
+        return dict(results)
+
+    async def _analyze(self, path: Path) -> List[Dict[str, Any]]:
+        """Run the multi-agent review on one file and return its findings."""
+        code = path.read_bytes().decode("utf-8")
+        event_bus = EventBus()
+
+        coordinator = CoordinatorAgent(event_bus)
+        coordinator.register_specialist("security", SecurityAgent(event_bus))
+        coordinator.register_specialist("bug", BugAgent(event_bus))
+
+        report = await coordinator.analyze(
+            code,
+            context={"filename": path.name, "shared_context": SharedContext(code)},
+        )
+
+        return report.get("findings", [])
 
 
 def calculate_metrics(tp: int, fp: int, fn: int) -> Tuple[float, float, float]:
@@ -170,3 +304,30 @@ def calculate_metrics(tp: int, fp: int, fn: int) -> Tuple[float, float, float]:
     f1 = 2 * precision * recall / (precision + recall) if (precision + recall) > 0 else 0.0
 
     return precision, recall, f1
+
+
+class TestEvaluation:
+    """Tests for TestHarness.evaluate_file."""
+
+    @pytest.mark.asyncio
+    async def test_matches_nearby_findings(self, tmp_path):
+        """Findings near an expected line match; others are FP or FN."""
+        ground_truth = tmp_path / "expected.json"
+        ground_truth.write_text(
+            '{"files": {"app.py": {"expected_findings": ['
+            '{"type": "security", "category": "SQL Injection", "title": "sqli",'
+            ' "line_start": 10, "line_end": 11},'
+            '{"type": "bug", "category": "Division by Zero", "title": "div",'
+            ' "line_start": 30, "line_end": 30}]}}}'
+        )
+        harness = TestHarness(str(ground_truth))
+
+        result = await harness.evaluate_file("app.py", [
+            {"agent_type": "security", "category": "sql_injection", "line": 12},
+            {"agent_type": "security", "category": "xss", "line": 30},
+            {"agent_type": "bug", "category": "logic", "line": 50},
+        ])
+
+        assert (result.true_positives, result.false_positives, result.false_negatives) == (1, 2, 1)
+        assert result.details[0] == {"status": "TP", "title": "sqli", "line": 12, "confidence": 1.0}
+        assert [d["status"] for d in result.details] == ["TP", "FP", "FP", "FN"]
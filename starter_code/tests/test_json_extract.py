@@ -0,0 +1,58 @@
+"""
+Tests for JSON extraction from LLM output.
+"""
+
+import pytest
+
+from src.llm.json_extract import JsonArrayStream, extract_json_array, find_json_array
+
+
+class TestFindJsonArray:
+    """Tests for the bracket-balancing scanner."""
+
+    def test_ignores_brackets_inside_strings(self):
+        """Brackets and escaped quotes in strings do not affect depth."""
+        text = 'Result: [{"msg": "a ] b \\" [x"}] trailing [1]'
+        begin, end = find_json_array(text)
+
+        assert text[begin:end] == '[{"msg": "a ] b \\" [x"}]'
+
+    def test_unbalanced_returns_none(self):
+        """Truncated arrays are not matched."""
+        assert find_json_array('[{"a": 1}') is None
+
+
+class TestExtractJsonArray:
+    """Tests for extract_json_array."""
+
+    def test_skips_bracketed_prose(self):
+        """Stray brackets before the JSON are skipped."""
+        text = 'Findings [see below]:\n[{"id": "b1"}]'
+
+        assert extract_json_array(text) == [{"id": "b1"}]
+
+    def test_no_array_raises(self):
+        """Responses without an array raise ValueError."""
+        with pytest.raises(ValueError):
+            extract_json_array("no findings")
+
+
+class TestJsonArrayStream:
+    """Tests for the incremental array parser."""
+
+    def test_yields_elements_as_they_close(self):
+        """Elements come out chunk by chunk; a bad tail keeps earlier ones."""
+        stream = JsonArrayStream()
+
+        assert stream.feed('Here: [{"id": "a", "d": "x ] }"}, {"id"') == [
+            {"id": "a", "d": "x ] }"}
+        ]
+        assert stream.feed(': "b"}, {"id": ') == [{"id": "b"}]
+        assert stream.feed("") == []
+
+    def test_keyed_array(self):
+        """With a key, only elements of that key's array are returned."""
+        stream = JsonArrayStream(key="steps")
+        text = '{"tags": [{"x": 1}], "steps": [{"step_id": "a", "depends_on": []}]}'
+
+        assert stream.feed(text) == [{"step_id": "a", "depends_on": []}]
@@ -0,0 +1,37 @@
+"""
+Tests for the LLMClient base interface.
+"""
+
+import asyncio
+import pytest
+
+from src.llm.base import LLMClient
+
+
+class EchoLLM(LLMClient):
+    """Echoes the user prompt and tracks peak concurrency."""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def generate(self, system_prompt, user_prompt, tools=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return f"{system_prompt}:{user_prompt}"
+
+
+class TestGenerateBatch:
+    """Tests for LLMClient.generate_batch."""
+
+    @pytest.mark.asyncio
+    async def test_requests_run_concurrently_in_order(self):
+        """All prompts are in flight at once; results keep prompt order."""
+        llm = EchoLLM()
+
+        results = await llm.generate_batch([("s", "a"), ("s", "b"), ("t", "c")])
+
+        assert results == ["s:a", "s:b", "t:c"]
+        assert llm.peak == 3
@@ -0,0 +1,73 @@
+"""
+Tests for the incremental plan step scheduler.
+"""
+
+import asyncio
+import pytest
+
+from src.planning.scheduler import StepScheduler
+
+
+class TestStepScheduler:
+    """Tests for StepScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_steps_added_while_running(self):
+        """Steps can arrive after run() started, dependents first."""
+        log = []
+
+        async def run_step(step):
+            await asyncio.sleep(0)
+            log.append(step["step_id"])
+
+        scheduler = StepScheduler(run_step)
+        runner = asyncio.create_task(scheduler.run())
+
+        scheduler.add({"step_id": "b", "depends_on": ["a"]})
+        await asyncio.sleep(0.01)
+        assert log == []
+
+        scheduler.add({"step_id": "a", "depends_on": []})
+        scheduler.close()
+
+        await asyncio.wait_for(runner, timeout=1)
+
+        assert log == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_step_errors_propagate(self):
+        """A failing step fails run()."""
+
+        async def run_step(step):
+            raise ValueError("boom")
+
+        scheduler = StepScheduler(run_step)
+        scheduler.add({"step_id": "a"})
+        scheduler.close()
+
+        with pytest.raises(ValueError):
+            await scheduler.run()
+
+    @pytest.mark.asyncio
+    async def test_failure_cancels_running_steps(self):
+        """When a step fails, steps still running are cancelled."""
+        cancelled = []
+
+        async def run_step(step):
+            if step["step_id"] == "fail":
+                raise ValueError("boom")
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(step["step_id"])
+                raise
+
+        scheduler = StepScheduler(run_step)
+        scheduler.add({"step_id": "slow"})
+        scheduler.add({"step_id": "fail"})
+        scheduler.close()
+
+        with pytest.raises(ValueError):
+            await asyncio.wait_for(scheduler.run(), timeout=1)
+
+        assert cancelled == ["slow"]
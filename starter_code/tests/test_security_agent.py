@@ -0,0 +1,170 @@
+"""
+Tests for SecurityAgent.
+"""
+
+import pytest
+
+from src.agents.security_agent import SecurityAgent
+from src.config import config
+from src.events import EventBus, EventType
+from src.llm.base import LLMClient
+
+
+class FakeLLM(LLMClient):
+    """Returns a canned response and counts calls."""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    async def generate(self, system_prompt, user_prompt, tools=None):
+        self.calls += 1
+        return self.response
+
+
+@pytest.fixture
+def make_agent(monkeypatch):
+    """Build a SecurityAgent backed by a FakeLLM."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+
+    def factory(response="[]"):
+        agent = SecurityAgent(EventBus())
+        agent._llm = FakeLLM(response)
+        return agent
+
+    return factory
+
+
+class TestSecurityAgent:
+    """Tests for SecurityAgent.analyze."""
+
+    @pytest.mark.asyncio
+    async def test_clean_code_skips_llm(self, make_agent):
+        """Code without risky sinks never reaches the LLM."""
+        agent = make_agent()
+
+        result = await agent.analyze("def add(a, b):\n    return a + b\n")
+
+        assert result == {"findings": []}
+        assert agent._llm.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_risky_code_is_analyzed(self, make_agent):
+        """Code with a sink goes to the LLM and findings are returned."""
+        agent = make_agent(
+            '[{"id": "s1", "category": "sql", "severity": "high", '
+            '"description": "d", "line": 1}]'
+        )
+
+        result = await agent.analyze('cursor.execute(f"SELECT {x}")')
+
+        assert agent._llm.calls == 1
+        assert [f["id"] for f in result["findings"]] == ["s1"]
+
+    @pytest.mark.asyncio
+    async def test_large_code_is_chunked(self, make_agent, monkeypatch):
+        """Large code is split at top-level definitions; lines map back."""
+        monkeypatch.setattr(config, "security_chunk_chars", 60)
+        agent = make_agent(
+            '[{"id": "s1", "category": "cmd", "severity": "high", '
+            '"description": "d", "line": 2}]'
+        )
+        code = (
+            "def a(cmd):\n    os.system(cmd)\n\n"
+            "def b(x):\n    return x + 1\n\n"
+            "def c(cmd):\n    os.system(cmd)\n"
+        )
+
+        chunks = agent._split_code(code)
+        result = await agent.analyze(code)
+
+        assert [offset for offset, _ in chunks] == [0, 6]
+        assert agent._llm.calls == 2
+        assert sorted(f["line"] for f in result["findings"]) == [2, 8]
+
+    def test_chunks_resolve_file_level_imports(self, make_agent, monkeypatch):
+        """A chunk calling a from-imported sink is kept without its import."""
+        monkeypatch.setattr(config, "security_chunk_chars", 60)
+        agent = make_agent()
+        code = (
+            "from os import system\n\n"
+            "def a(x):\n    return x + 1\n\n"
+            "def b(cmd):\n    system(cmd)\n"
+        )
+
+        assert [offset for offset, _ in agent._split_code(code)] == [5]
+
+    @pytest.mark.asyncio
+    async def test_sinks_in_comments_are_ignored(self, make_agent):
+        """Mentions in comments and docstrings do not trigger analysis."""
+        agent = make_agent()
+
+        await agent.analyze(
+            '# never eval(user_input) or os.system it\n'
+            'def add(a, b):\n    """Like SELECT, but for numbers."""\n    return a + b\n'
+        )
+
+        assert agent._llm.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_known_token_prefix_is_analyzed(self, make_agent):
+        """Literals shaped like provider API tokens reach the LLM."""
+        agent = make_agent()
+
+        await agent.analyze('HOOK = "whsec_' + "a" * 24 + '"\n')
+
+        assert agent._llm.calls == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("code", [
+        "from os import system\nsystem(cmd)\n",
+        "import os as o\no.popen(cmd)\n",
+        "from yaml import load as parse\nparse(data)\n",
+        "import os as o\nrun = o.system\n",
+        "from os import *\nsystem(cmd)\n",
+        "import os\ngetattr(os, name)(cmd)\n",
+    ])
+    async def test_sinks_behind_import_aliases_are_analyzed(self, make_agent, code):
+        """Aliases are resolved; star imports and dynamic lookups count as sinks."""
+        agent = make_agent()
+
+        await agent.analyze(code)
+
+        assert agent._llm.calls == 1
+
+    def test_extract_nested_array_after_prose(self, make_agent):
+        """Nested arrays in findings survive extraction."""
+        agent = make_agent()
+
+        findings = agent._extract_json_array(
+            'Here you go: [{"id": "s1", "category": "sql", "severity": "high", '
+            '"description": "d", "line": 3, "refs": ["a", "b"]}] done'
+        )
+
+        assert findings[0]["refs"] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_findings_published_while_streaming(self, make_agent):
+        """A finding is published as soon as its object closes."""
+        agent = make_agent()
+        published = []
+        agent.event_bus.subscribe(
+            lambda event: published.append(event.data["id"]),
+            event_type=EventType.FINDING_DISCOVERED,
+        )
+        seen_mid_stream = []
+
+        async def stream(**kwargs):
+            yield '[{"id": "s1", "category": "sql", "severity": "high", '
+            yield '"description": "d", "line": 1}, '
+            seen_mid_stream.extend(published)
+            yield '{"id": "s2", "category": "sql", "severity": "low", '
+            yield '"description": "e", "line": 2}]'
+
+        agent._llm.stream = stream
+
+        result = await agent.analyze('cursor.execute(f"SELECT {x}")')
+
+        assert seen_mid_stream == ["s1"]
+        assert published == ["s1", "s2"]
+        assert [f["id"] for f in result["findings"]] == ["s1", "s2"]
@@ -0,0 +1,55 @@
+"""
+Tests for SharedContext consolidation.
+"""
+
+from src.context.shared_context import SharedContext
+
+
+def _finding(category, line, severity="low", agent_type="security", description="d"):
+    return {
+        "category": category,
+        "line": line,
+        "severity": severity,
+        "agent_type": agent_type,
+        "description": description,
+    }
+
+
+class TestConsolidate:
+    """Tests for SharedContext.consolidate."""
+
+    def test_duplicates_are_merged(self):
+        """Findings with the same category, line and description count once."""
+        context = SharedContext("x = 1")
+        first = _finding("sql", 3, "high")
+
+        context.add_finding(first)
+        context.add_finding(_finding("sql", 3, "low", agent_type="bug"))
+        context.add_finding(_finding("sql", 4))
+
+        report = context.consolidate()
+
+        assert report["total_findings"] == 2
+        assert report["findings"][0] is first
+
+    def test_ranking_and_summary(self):
+        """Findings are ranked by severity and summarized."""
+        context = SharedContext("x = 1")
+
+        for finding in (
+            _finding("a", 1, "low"),
+            _finding("b", 2, "critical", agent_type="bug"),
+            _finding("c", 3, "medium"),
+        ):
+            context.add_finding(finding)
+
+        report = context.consolidate()
+
+        assert [f["category"] for f in report["findings"]] == ["b", "c", "a"]
+        assert report["risk_score"] == 4 + 2 + 1
+        assert report["severity_breakdown"] == {"low": 1, "critical": 1, "medium": 1}
+        assert report["agent_breakdown"] == {"security": 2, "bug": 1}
+
+    def test_empty_report(self):
+        """No findings gives an empty report."""
+        assert SharedContext("").consolidate()["total_findings"] == 0
@@ -0,0 +1,83 @@
+"""
+Tests for the console streaming UI.
+"""
+
+import asyncio
+import json
+import socket
+import pytest
+
+from src.events import Event, EventBus, EventType
+from src.ui.streaming_server import ConsoleStreamingUI, StreamingServer
+
+
+class TestConsoleStreamingUI:
+    """Tests for ConsoleStreamingUI."""
+
+    @pytest.mark.asyncio
+    async def test_rendering_is_off_the_publish_path(self, monkeypatch):
+        """Publishing only queues events; stop() renders everything."""
+        event_bus = EventBus()
+        ui = ConsoleStreamingUI(event_bus)
+        rendered = []
+        monkeypatch.setattr(ui, "_handle_event", lambda event: rendered.append(event.agent_id))
+        ui.start()
+
+        for agent in ("security", "bug"):
+            await event_bus.publish(Event(event_type=EventType.AGENT_STARTED, agent_id=agent, data={}))
+
+        assert rendered == []
+
+        await ui.stop()
+
+        assert rendered == ["security", "bug"]
+        assert not event_bus.has_subscribers(EventType.AGENT_STARTED)
+
+
+class TestStreamingServer:
+    """Tests for the SSE streaming server."""
+
+    @pytest.mark.asyncio
+    async def test_streams_events_as_sse(self):
+        """Published events reach a connected client as SSE messages."""
+        aiohttp = pytest.importorskip("aiohttp")
+        event_bus = EventBus()
+        server = StreamingServer(event_bus, "127.0.0.1", 0)
+        serving = asyncio.create_task(server.start())
+        await server.wait_started()
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{server.port}/events") as response:
+                assert response.headers["Content-Type"] == "text/event-stream"
+
+                await event_bus.publish(Event(
+                    event_type=EventType.FINDING_DISCOVERED,
+                    agent_id="security",
+                    data={"id": "s1"},
+                ))
+
+                lines = [(await response.content.readline()).decode() for _ in range(3)]
+
+        assert lines[1] == "event: finding_discovered\n"
+        assert json.loads(lines[2][len("data: "):])["data"] == {"id": "s1"}
+
+        await server.stop()
+        await asyncio.wait_for(serving, 5)
+        assert not event_bus.has_subscribers(EventType.FINDING_DISCOVERED)
+
+    def test_client_socket_tuning(self):
+        """Client sockets get the configured send buffer."""
+
+        class Transport:
+            def __init__(self, sock):
+                self.sock = sock
+
+            def get_extra_info(self, name):
+                return self.sock if name == "socket" else None
+
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            default = sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF)
+
+            StreamingServer._tune_socket(Transport(sock))
+
+            assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) > default